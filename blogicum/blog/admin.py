@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Category, Comment, Location, Post
+from .models import Category, Comment, ImageTask, Location, Post
 
 
 admin.site.empty_value_display = 'Не задано'
@@ -9,3 +9,4 @@ admin.site.register(Post)
 admin.site.register(Category)
 admin.site.register(Comment)
 admin.site.register(Location)
+admin.site.register(ImageTask)
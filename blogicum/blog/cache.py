@@ -0,0 +1,137 @@
+import time
+from datetime import datetime, timezone as dt_timezone
+from hashlib import md5
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Min
+from django.utils import timezone
+
+from .models import Post
+
+
+GLOBAL_TAG = 'global'
+INDEX_TAG = 'index'
+VERSION_KEY = 'blog:version:{}'
+NEXT_PUBLICATION_KEY = 'blog:next_publication'
+PUBLICATIONS_CHECKED_KEY = 'blog:publications_checked'
+NO_PUBLICATION = ''
+
+
+def get_cache():
+    return caches[settings.PAGE_CACHE_ALIAS]
+
+
+def new_version():
+    # Время в начале версии даёт Last-Modified без запросов к базе.
+    return f'{time.time_ns():x}-{uuid4().hex}'
+
+
+def version_time(version):
+    stamp, separator, _ = version.partition('-')
+    if not separator:
+        return None
+    return datetime.fromtimestamp(int(stamp, 16) / 1e9, tz=dt_timezone.utc)
+
+
+def get_versions(tags):
+    """Возвращает текущие версии тегов, заводя недостающие."""
+    cache = get_cache()
+    keys = {VERSION_KEY.format(tag): tag for tag in tags}
+    versions = cache.get_many(keys)
+    for key in keys.keys() - versions.keys():
+        cache.add(key, new_version(), timeout=None)
+        versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump(*tags):
+    """Инвалидирует всё, что закэшировано с указанными тегами."""
+    get_cache().set_many(
+        {VERSION_KEY.format(tag): new_version() for tag in tags},
+        timeout=None
+    )
+
+
+def get_next_publication():
+    """Возвращает время ближайшей отложенной публикации или None.
+
+    Значение хранится в кэше, пока это время не наступит или пока
+    не изменится какая-либо публикация.
+    """
+    cache = get_cache()
+    now = timezone.now()
+    next_publication = cache.get(NEXT_PUBLICATION_KEY)
+    if next_publication is None or (
+        next_publication != NO_PUBLICATION and next_publication <= now
+    ):
+        next_publication = Post.objects.filter(
+            is_published=True, pub_date__gt=now
+        ).aggregate(next=Min('pub_date'))['next'] or NO_PUBLICATION
+        cache.set_many({
+            NEXT_PUBLICATION_KEY: next_publication,
+            PUBLICATIONS_CHECKED_KEY: now,
+        }, timeout=None)
+    return next_publication or None
+
+
+def get_publications_checked():
+    """Возвращает время последнего пересчёта ближайшей публикации.
+
+    Отложенная публикация выходит без сигналов: это замечает первый
+    запрос после её времени, и с момента пересчёта страницы могли
+    измениться.
+    """
+    get_next_publication()
+    cache = get_cache()
+    checked = cache.get(PUBLICATIONS_CHECKED_KEY)
+    if checked is None:
+        checked = timezone.now()
+        cache.set(PUBLICATIONS_CHECKED_KEY, checked, timeout=None)
+    return checked
+
+
+def reset_next_publication():
+    get_cache().delete(NEXT_PUBLICATION_KEY)
+
+
+def make_digest(tags, *parts):
+    """Хеш, который меняется при изменении тегов.
+
+    Включает также ближайшую отложенную публикацию, поэтому
+    закэшированное остаётся верным ровно до её выхода.
+    """
+    tags = (GLOBAL_TAG, *tags)
+    return md5('|'.join(map(str, (
+        *get_versions(tags), get_next_publication(), *parts
+    ))).encode()).hexdigest()
+
+
+def make_key(prefix, tags, *parts):
+    """Собирает ключ, который меняется при изменении тегов."""
+    return f'blog:{prefix}:{make_digest(tags, *parts)}'
+
+
+def get_last_modified(tags):
+    """Время последнего изменения тегов или отложенных публикаций."""
+    times = [
+        version_time(version)
+        for version in get_versions((GLOBAL_TAG, *tags))
+    ]
+    if None in times:
+        # Версия заведена до того, как в неё стали писать время.
+        return None
+    return max(*times, get_publications_checked())
+
+
+def category_tag(slug):
+    return f'category:{slug}'
+
+
+def profile_tag(username):
+    return f'profile:{username}'
+
+
+def post_tag(post_id):
+    return f'post:{post_id}'
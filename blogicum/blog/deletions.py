@@ -0,0 +1,47 @@
+from collections import Counter
+from contextlib import contextmanager
+from threading import local
+
+from django.dispatch import Signal
+
+
+# Отправляется после массового удаления комментариев: `counts` — число
+# удалённых комментариев по id поста.
+comments_deleted = Signal()
+
+_state = local()
+
+
+def deleting_posts():
+    """Id постов, которые удаляются прямо сейчас в этом потоке.
+
+    Их комментарии удаляются каскадом, и обновлять для них счётчик
+    и кэш страниц поста незачем.
+    """
+    if not hasattr(_state, 'posts'):
+        _state.posts = set()
+    return _state.posts
+
+
+def grouped_comment_counts():
+    """Счётчик удалённых комментариев при массовом удалении или None."""
+    return getattr(_state, 'comments', None)
+
+
+@contextmanager
+def group_comment_deletes(sender):
+    """Копит удалённые комментарии по постам и отправляет comments_deleted.
+
+    Обработчики post_delete комментариев на время удаления только
+    считают их, а работа по каждому посту делается один раз.
+    """
+    outer = grouped_comment_counts()
+    if outer is not None:
+        yield
+        return
+    counts = _state.comments = Counter()
+    try:
+        yield
+    finally:
+        del _state.comments
+    comments_deleted.send(sender=sender, counts=counts)
@@ -0,0 +1,165 @@
+from django.contrib.syndication.views import Feed
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import http_date, quote_etag
+
+from core.constants import FEED_ITEMS, PAGE_CACHE_TIMEOUT, USER
+
+from .cache import (
+    INDEX_TAG,
+    category_tag,
+    get_cache,
+    get_last_modified,
+    make_digest,
+    make_key,
+    profile_tag
+)
+from .models import Post
+from .registry import categories
+
+SITE_TITLE = 'Блогикум'
+
+
+class CachedFeedMixin:
+    """Кэширует готовый документ ленты и отвечает 304 без его сборки.
+
+    Лента одинакова для всех, поэтому валидаторы зависят только от
+    версий тегов get_cache_tags().
+    """
+
+    def get_cache_tags(self, **kwargs):
+        raise NotImplementedError
+
+    def __call__(self, request, *args, **kwargs):
+        tags = self.get_cache_tags(**kwargs)
+        etag = quote_etag(make_digest(tags, 'feed', request.path))
+        last_modified = get_last_modified(tags)
+        if last_modified is not None:
+            last_modified = int(last_modified.timestamp())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            cache = get_cache()
+            key = make_key('feed', tags, request.path)
+            response = cache.get(key)
+            if response is None:
+                response = super().__call__(request, *args, **kwargs)
+                cache.set(key, response, PAGE_CACHE_TIMEOUT)
+        response['ETag'] = etag
+        # Feed ставит время последней записи, а снятая с публикации
+        # запись его не меняет.
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        elif response.has_header('Last-Modified'):
+            del response['Last-Modified']
+        patch_cache_control(response, public=True, no_cache=True)
+        return response
+
+
+class PostFeed(CachedFeedMixin, Feed):
+    title = SITE_TITLE
+
+    def get_cache_tags(self, **kwargs):
+        return (INDEX_TAG,)
+
+    def description(self, obj):
+        return 'Новые публикации'
+
+    def link(self):
+        return reverse('blog:index')
+
+    def get_posts(self, obj):
+        return Post.public_posts.all()
+
+    def items(self, obj):
+        return self.get_posts(obj).order_by('-pub_date')[:FEED_ITEMS]
+
+    def item_title(self, post):
+        return post.title
+
+    def item_description(self, post):
+        return post.text
+
+    def item_link(self, post):
+        return reverse('blog:post_detail', args=(post.pk,))
+
+    def item_pubdate(self, post):
+        return post.pub_date
+
+    def item_updateddate(self, post):
+        # Отложенная запись меняется до выхода.
+        return max(post.updated_at, post.pub_date)
+
+    def item_author_name(self, post):
+        return post.author.username
+
+    def item_categories(self, post):
+        return (post.category.title,)
+
+
+class CategoryFeed(PostFeed):
+
+    def get_cache_tags(self, category_slug):
+        return (category_tag(category_slug),)
+
+    def get_object(self, request, category_slug):
+        category = categories.lookup('slug', category_slug)
+        if category is None or not category.is_published:
+            raise Http404('Категория не найдена.')
+        return category
+
+    def title(self, category):
+        return f'{SITE_TITLE}: {category.title}'
+
+    def description(self, category):
+        return category.description
+
+    def link(self, category):
+        return reverse('blog:category_posts', args=(category.slug,))
+
+    def get_posts(self, category):
+        return Post.public_posts.filter(category_id=category.pk)
+
+
+class AuthorFeed(PostFeed):
+
+    def get_cache_tags(self, username):
+        return (profile_tag(username),)
+
+    def get_object(self, request, username):
+        return get_object_or_404(USER, username=username)
+
+    def title(self, author):
+        return f'{SITE_TITLE}: @{author.username}'
+
+    def description(self, author):
+        return f'Публикации пользователя {author.username}'
+
+    def link(self, author):
+        return reverse('blog:profile', args=(author.username,))
+
+    def get_posts(self, author):
+        return Post.public_posts.filter(author_id=author.pk)
+
+
+class AtomFeedMixin:
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+class PostAtomFeed(AtomFeedMixin, PostFeed):
+    pass
+
+
+class CategoryAtomFeed(AtomFeedMixin, CategoryFeed):
+    pass
+
+
+class AuthorAtomFeed(AtomFeedMixin, AuthorFeed):
+    pass
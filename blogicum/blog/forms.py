@@ -3,7 +3,9 @@ from django.contrib.auth.forms import UserCreationForm
 
 from core.constants import USER
 
+from .images import find_renditions
 from .models import Post, Comment
+from .tasks import enqueue_renditions
 
 
 class CustomUserCreationForm(UserCreationForm):
@@ -32,6 +34,27 @@ class PostForm(forms.ModelForm):
             )
         }
 
+    def save(self, commit=True):
+        post = super().save(commit=False)
+        image_changed = 'image' in self.changed_data
+        if image_changed:
+            post.image_renditions = []
+            if post.image:
+                # Имя файла в хранилище зависит от содержимого, поэтому
+                # сохраняем его сразу и берём готовые копии, если такое
+                # фото уже загружали.
+                post.image.save(post.image.name, post.image.file, save=False)
+                post.image_renditions = find_renditions(post.image.name)
+            post.image_processing = (
+                bool(post.image) and not post.image_renditions
+            )
+        if commit:
+            post.save()
+            self._save_m2m()
+            if post.image_processing and image_changed:
+                enqueue_renditions(post)
+        return post
+
 
 class CommentForm(forms.ModelForm):
 
@@ -0,0 +1,105 @@
+import hashlib
+import posixpath
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, features
+
+from core.constants import IMAGE_RENDITION_QUALITY, IMAGE_RENDITION_WIDTHS
+from core.storage import ContentAddressedStorage
+
+from .models import Post
+
+
+RENDITIONS_DIR = 'renditions'
+
+if features.check('webp'):
+    RENDITION_FORMAT, RENDITION_EXTENSION = 'WEBP', 'webp'
+else:
+    RENDITION_FORMAT, RENDITION_EXTENSION = 'JPEG', 'jpg'
+
+
+def rendition_widths(width):
+    """Ширины копий: не больше оригинала, без дублей."""
+    return sorted({min(target, width) for target in IMAGE_RENDITION_WIDTHS})
+
+
+def make_renditions(name, storage):
+    """Сохраняет уменьшенные копии изображения `name` рядом с ним.
+
+    Имена копий строятся из хеша оригинала, поэтому копии принадлежат
+    только ему и удаляются вместе с ним, даже если у двух разных
+    оригиналов они совпадают байт в байт.
+    Возвращает список [ширина, имя файла] по возрастанию ширины.
+    """
+    path = PurePosixPath(name)
+    upload_dir = path.parts[0] if len(path.parts) > 1 else ''
+    digest = (
+        ContentAddressedStorage.name_digest(name)
+        or hashlib.sha256(name.encode()).hexdigest()
+    )
+    largest = max(IMAGE_RENDITION_WIDTHS)
+    with storage.open(name, 'rb') as file, Image.open(file) as original:
+        # JPEG сразу декодируется в уменьшенном масштабе.
+        original.draft('RGB', (largest, largest))
+        source = ImageOps.exif_transpose(original)
+        has_alpha = RENDITION_FORMAT == 'WEBP' and (
+            source.mode in ('RGBA', 'LA')
+            or 'transparency' in source.info
+        )
+        source = source.convert('RGBA' if has_alpha else 'RGB')
+        renditions = []
+        for width in rendition_widths(source.width):
+            height = max(1, round(source.height * width / source.width))
+            buffer = BytesIO()
+            # EXIF, в том числе геопозиция, в копии не переносится.
+            source.resize(
+                (width, height), Image.Resampling.LANCZOS
+            ).save(
+                buffer, RENDITION_FORMAT,
+                quality=IMAGE_RENDITION_QUALITY, exif=b''
+            )
+            renditions.append([width, storage.save_derived(
+                posixpath.join(
+                    upload_dir, RENDITIONS_DIR, digest[:2],
+                    f'{digest[2:]}-{width}.{RENDITION_EXTENSION}'
+                ),
+                ContentFile(buffer.getvalue())
+            )])
+    return renditions
+
+
+def delete_renditions(renditions, storage):
+    for _, name in renditions:
+        storage.delete(name)
+
+
+def find_renditions(name):
+    """Готовые копии фото с тем же файлом, если оно уже загружалось."""
+    candidates = Post.objects.filter(
+        image=name, image_processing=False
+    ).values_list('image_renditions', flat=True)
+    return next(filter(None, candidates.iterator()), [])
+
+
+def release_image(name, renditions, storage):
+    """Удаляет фото и его копии, если на них не ссылается ни один пост.
+
+    Одинаковые загрузки хранятся одним файлом, поэтому число ссылок —
+    это число постов с тем же именем файла. Проверка и удаление идут под
+    блокировкой хранилища, а только что загруженный заново файл
+    (storage.is_leased) не удаляется, пока его пост не сохранён.
+    """
+    if not name:
+        return False
+    with storage.lock():
+        if (
+            Post.objects.filter(image=name).exists()
+            or storage.is_leased(name)
+        ):
+            return False
+        storage.delete(name)
+        delete_renditions(renditions or (), storage)
+    storage.settle(name)
+    return True
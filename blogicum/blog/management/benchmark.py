@@ -0,0 +1,18 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+
+class BenchmarkCommand(BaseCommand):
+    """Общая часть команд замера запросов."""
+
+    def report(self, label, query, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = perf_counter()
+            query()
+            timings.append(perf_counter() - start)
+        self.stdout.write(
+            f'  {label}: best {min(timings) * 1000:.2f} ms, '
+            f'worst {max(timings) * 1000:.2f} ms'
+        )
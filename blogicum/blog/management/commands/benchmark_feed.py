@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.constants import POSTS_PER_PAGE, USER
+
+from blog.management.benchmark import BenchmarkCommand
+from blog.models import Category, Post
+from blog.search import get_backend
+from blog.utils import public_feed_posts
+
+
+BATCH_SIZE = 10_000
+SEED_CATEGORIES = 10
+
+
+class Command(BenchmarkCommand):
+    help = (
+        'Замеряет запросы ленты публикаций и выводит их план выполнения. '
+        'С ключом --seed предварительно наполняет базу тестовыми постами '
+        'и перестраивает поисковый индекс; запускайте на отдельной копии '
+        'базы данных.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Сколько публикаций создать перед замером.'
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help='Сколько раз повторить каждый запрос.'
+        )
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            self.seed(options['seed'])
+            # bulk_create не вызывает сигналы, обновляющие индекс поиска.
+            backend = get_backend()
+            if backend.is_available():
+                backend.rebuild()
+        category = Category.objects.filter(is_published=True).first()
+        author = Post.objects.values_list('author_id', flat=True).first()
+        feeds = {'index': public_feed_posts()}
+        if category:
+            feeds['category'] = feeds['index'].filter(category=category)
+        if author:
+            feeds['profile'] = feeds['index'].filter(author_id=author)
+        for name, queryset in feeds.items():
+            page = queryset[:POSTS_PER_PAGE]
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(page.explain())
+            self.report(
+                'first page', lambda: list(page.all()), options['repeat']
+            )
+            self.report('count', queryset.count, options['repeat'])
+
+    @transaction.atomic
+    def seed(self, total):
+        author, _ = USER.objects.get_or_create(username='benchmark')
+        categories = [
+            Category.objects.get_or_create(
+                slug=f'benchmark-{number}',
+                defaults={
+                    'title': f'Benchmark {number}',
+                    'description': 'Категория для замеров.',
+                    'is_published': number % 5 != 0,
+                },
+            )[0]
+            for number in range(SEED_CATEGORIES)
+        ]
+        start = timezone.now()
+        for offset in range(0, total, BATCH_SIZE):
+            Post.objects.bulk_create(
+                Post(
+                    title=f'Benchmark post {number}',
+                    text='Текст публикации для замеров. ' * 20,
+                    pub_date=start - timedelta(minutes=number - total // 100),
+                    author=author,
+                    category=categories[number % SEED_CATEGORIES],
+                    is_published=number % 20 != 0,
+                )
+                for number in range(offset, min(offset + BATCH_SIZE, total))
+            )
+            self.stdout.write(f'Создано {min(offset + BATCH_SIZE, total)}')
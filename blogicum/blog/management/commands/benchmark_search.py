@@ -0,0 +1,38 @@
+from core.constants import POSTS_PER_PAGE
+
+from blog.management.benchmark import BenchmarkCommand
+from blog.search import search_posts
+
+
+class Command(BenchmarkCommand):
+    help = (
+        'Замеряет поиск по публикациям. Наполнить базу и перестроить '
+        'индекс можно командой benchmark_feed --seed N.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'queries', nargs='*',
+            default=['публикации', 'benchmark post 42', 'текст замеров'],
+            help='Поисковые запросы для замера.'
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help='Сколько раз повторить каждый запрос.'
+        )
+
+    def handle(self, *args, **options):
+        for query in options['queries']:
+            self.stdout.write(self.style.MIGRATE_HEADING(query))
+            # Результаты кэшируют видимые id, поэтому создаются в каждом
+            # замере заново.
+            self.report(
+                'first page',
+                lambda: list(search_posts(query)[:POSTS_PER_PAGE]),
+                options['repeat']
+            )
+            self.report(
+                'count',
+                lambda: search_posts(query).count(),
+                options['repeat']
+            )
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+from blog.utils import fill_excerpts
+
+
+class Command(BaseCommand):
+    help = 'Заполняет сохранённые анонсы у всех публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Сколько публикаций обновлять за один запрос.'
+        )
+
+    def handle(self, *args, **options):
+        updated = fill_excerpts(Post.objects.all(), options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Обновлено публикаций: {updated}'
+        ))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+from blog.tasks import enqueue_missing_renditions
+
+
+class Command(BaseCommand):
+    help = (
+        'Ставит в очередь фото публикаций без уменьшенных копий. '
+        'Очередь разбирает команда process_image_tasks.'
+    )
+
+    def handle(self, *args, **options):
+        queued = enqueue_missing_renditions(Post.objects.all())
+        self.stdout.write(self.style.SUCCESS(
+            f'Поставлено в очередь: {queued}'
+        ))
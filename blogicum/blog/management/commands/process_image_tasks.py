@@ -0,0 +1,57 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import django
+from django.core.management.base import BaseCommand
+
+from blog.tasks import claim_tasks, run_tasks
+
+
+class Command(BaseCommand):
+    help = 'Обрабатывает очередь фото публикаций в пуле процессов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Размер пула процессов; 0 — обрабатывать в текущем.'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Разобрать очередь и завершиться.'
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=1.0,
+            help='Пауза между проверками пустой очереди, в секундах.'
+        )
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        executor = None
+        if workers:
+            # Дочерние процессы не наследуют соединение с базой:
+            # с файлами фото они работают без неё.
+            executor = ProcessPoolExecutor(
+                workers, mp_context=get_context('spawn'),
+                initializer=django.setup
+            )
+        processed = 0
+        try:
+            while True:
+                tasks = claim_tasks(max(workers, 1) * 2)
+                if tasks:
+                    run_tasks(tasks, executor)
+                    processed += len(tasks)
+                elif options['once']:
+                    break
+                else:
+                    time.sleep(options['poll_interval'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано задач: {processed}'
+        ))
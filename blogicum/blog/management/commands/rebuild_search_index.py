@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.search import get_backend
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый индекс публикаций.'
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        if not backend.is_available():
+            raise CommandError(
+                'Таблица полнотекстового поиска не найдена: '
+                'проверьте, что SQLite поддерживает FTS5, '
+                "или выберите SEARCH_BACKEND = 'inverted'."
+            )
+        backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Индекс перестроен ({type(backend).__name__}).'
+        ))
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-18 04:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_Create_post_fts_table'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_renditions',
+            field=models.JSONField(blank=True, default=list, editable=False, verbose_name='Уменьшенные копии фото'),
+        ),
+    ]
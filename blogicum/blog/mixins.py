@@ -1,19 +1,83 @@
+from http import HTTPStatus
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.paginator import InvalidPage
+from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse_lazy
+from django.utils.cache import patch_cache_control
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+from django.views.decorators.http import condition
+
+from core.constants import (
+    MAX_COUNTED_POSTS,
+    MAX_OFFSET_PAGES,
+    PAGE_CACHE_TIMEOUT
+)
 
+from .cache import get_cache, get_last_modified, make_digest, make_key
 from .models import Comment, Post
+from .paginators import CachedCountPaginator, KeysetPaginator
+from .registry import attach_categories_and_locations
+from .uploads import ImageUploadHandler
+
+
+class AuthorOnlyMixin:
+    """Пускает к объекту только его автора.
+
+    Объект загружается один раз и переиспользуется обобщённым
+    представлением через `get_object()`.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        self.object = get_object_or_404(
+            self.model, pk=kwargs[self.pk_url_kwarg]
+        )
+        if self.object.author_id != request.user.pk:
+            return self.handle_not_author()
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_object(self, queryset=None):
+        return self.object
+
+    def handle_not_author(self):
+        raise NotImplementedError
+
+
+class ImageUploadMixin:
+    """Проверяет фото потоково, пока оно загружается.
 
+    Обработчики загрузки можно сменить только до чтения request.POST,
+    а его читает CsrfViewMiddleware, поэтому проверка CSRF выполняется
+    внутри dispatch, после подключения обработчика.
+    """
 
-class PostUpdateDeleteMixin:
+    @method_decorator(csrf_exempt)
+    def dispatch(self, request, *args, **kwargs):
+        self.upload_handler = ImageUploadHandler(request)
+        request.upload_handlers.insert(0, self.upload_handler)
+        return self.protected_dispatch(request, *args, **kwargs)
+
+    @method_decorator(csrf_protect)
+    def protected_dispatch(self, request, *args, **kwargs):
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_form(self, form_class=None):
+        form = super().get_form(form_class)
+        if self.upload_handler.error:
+            form.add_error('image', self.upload_handler.error)
+        return form
+
+
+class PostUpdateDeleteMixin(AuthorOnlyMixin):
     model = Post
     template_name = 'blog/create.html'
     pk_url_kwarg = 'post_id'
 
-    def dispatch(self, request, *args, **kwargs):
-        instance = get_object_or_404(Post, pk=kwargs['post_id'])
-        if instance.author != request.user:
-            return redirect('blog:post_detail', post_id=instance.pk)
-        return super().dispatch(request, *args, **kwargs)
+    def handle_not_author(self):
+        return redirect('blog:post_detail', post_id=self.object.pk)
 
     def get_success_url(self):
         return reverse_lazy(
@@ -22,16 +86,164 @@ class PostUpdateDeleteMixin:
         )
 
 
-class CommentUpdateDeleteMixin:
+class CommentUpdateDeleteMixin(AuthorOnlyMixin):
     model = Comment
     template_name = 'blog/comment.html'
     pk_url_kwarg = 'comment_id'
 
+    def handle_not_author(self):
+        return redirect('blog:post_detail', post_id=self.object.post_id)
+
+
+class AnonymousPageCacheMixin:
+    """Кэширует страницу целиком для анонимных посетителей.
+
+    В ключ попадают только параметры из cache_query_params: метки
+    рекламных кампаний и прочие лишние параметры не плодят копий.
+    """
+
+    cache_query_params = ('page', 'after', 'before')
+
+    def get_cache_tags(self):
+        raise NotImplementedError
+
+    def get_cache_path(self):
+        query = self.request.GET
+        return self.request.path + '?' + urlencode(sorted(
+            (name, query[name])
+            for name in self.cache_query_params if name in query
+        ))
+
     def dispatch(self, request, *args, **kwargs):
-        instance = get_object_or_404(self.model, pk=kwargs['comment_id'])
-        if instance.author != request.user:
-            return redirect('blog:post_detail', post_id=instance.post_id)
-        return super().dispatch(request, *args, **kwargs)
+        if request.method != 'GET' or request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+        cache = get_cache()
+        key = make_key('page', self.get_cache_tags(), self.get_cache_path())
+        response = cache.get(key)
+        if response is not None:
+            return response
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code != HTTPStatus.OK:
+            return response
+        if callable(getattr(response, 'render', None)):
+            response.add_post_render_callback(
+                lambda rendered: cache.set(key, rendered, PAGE_CACHE_TIMEOUT)
+            )
+        else:
+            cache.set(key, response, PAGE_CACHE_TIMEOUT)
+        return response
+
+
+class ConditionalGetMixin:
+    """Отвечает 304, если страница не менялась с прошлого запроса.
+
+    ETag и Last-Modified считаются по версиям тегов get_cache_tags(),
+    без рендеринга шаблона. Ставится перед AnonymousPageCacheMixin.
+    """
+
+    def get_etag(self, request, *args, **kwargs):
+        user = request.user
+        parts = [request.get_full_path(), user.pk]
+        if user.is_authenticated:
+            # В форме комментария CSRF-токен, он меняется при входе.
+            parts.append(request.COOKIES.get(settings.CSRF_COOKIE_NAME))
+        return make_digest(self.get_cache_tags(), *parts)
+
+    def get_last_modified(self, request, *args, **kwargs):
+        # Вход и выход не меняют время, поэтому для пользователей
+        # страница проверяется только по ETag.
+        if request.user.is_authenticated:
+            return None
+        return get_last_modified(self.get_cache_tags())
+
+    def dispatch(self, request, *args, **kwargs):
+        response = condition(self.get_etag, self.get_last_modified)(
+            super().dispatch
+        )(request, *args, **kwargs)
+        if request.method in ('GET', 'HEAD'):
+            # Без явного no-cache браузер закэширует страницу по
+            # Last-Modified и не будет её перепроверять.
+            patch_cache_control(response, no_cache=True)
+            if request.user.is_authenticated:
+                patch_cache_control(response, private=True)
+        return response
+
+
+class KeysetPaginationMixin:
+    """Курсорная пагинация по параметрам `after`/`before`.
+
+    С `keyset_links` по номеру доступны только первые MAX_OFFSET_PAGES
+    страниц, а ссылки «вперёд/назад» на них строятся по курсорам, так что
+    глубокие страницы ленты не требуют OFFSET. При приблизительном
+    подсчёте ссылка «вперёд» есть и на последней посчитанной странице.
+    """
+
+    keyset_ordering = ('-pub_date', '-id')
+    keyset_only = False
+    keyset_links = False
+
+    def paginate_queryset(self, queryset, page_size):
+        after = self.request.GET.get('after')
+        before = self.request.GET.get('before')
+        if after is None and before is None:
+            if not self.keyset_only:
+                return self.paginate_by_offset(queryset, page_size)
+            after = ''
+        paginator = KeysetPaginator(queryset, page_size, self.keyset_ordering)
+        try:
+            page = paginator.page(after=after, before=before)
+        except InvalidPage as error:
+            raise Http404(str(error))
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    def paginate_by_offset(self, queryset, page_size):
+        if not self.keyset_links:
+            return super().paginate_queryset(queryset, page_size)
+        paginator, page, object_list, is_paginated = super().paginate_queryset(
+            queryset.order_by(*self.keyset_ordering), page_size
+        )
+        if page.number > MAX_OFFSET_PAGES:
+            raise Http404('Дальше по ленте переходят по курсору.')
+        page.object_list = list(object_list)
+        cursors = KeysetPaginator(queryset, page_size, self.keyset_ordering)
+        page.next_cursor = page.previous_cursor = None
+        if page.object_list and (
+            page.has_next() or getattr(paginator, 'is_approximate', False)
+        ):
+            page.next_cursor = cursors.encode_cursor(page.object_list[-1])
+        if page.object_list and page.has_previous():
+            page.previous_cursor = cursors.encode_cursor(page.object_list[0])
+        page.page_links = range(
+            1, min(paginator.num_pages, MAX_OFFSET_PAGES) + 1
+        )
+        return paginator, page, page.object_list, is_paginated
+
+
+class CachedCountMixin:
+    paginator_class = CachedCountPaginator
+    count_limit = MAX_COUNTED_POSTS
+
+    def get_count_cache_parts(self):
+        return (type(self).__name__,)
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        return super().get_paginator(
+            queryset,
+            per_page,
+            cache_tags=self.get_cache_tags(),
+            cache_parts=self.get_count_cache_parts(),
+            count_limit=self.count_limit,
+            **kwargs
+        )
+
+
+class RelatedFromRegistryMixin:
+    def paginate_queryset(self, queryset, page_size):
+        paginator, page, object_list, is_paginated = (
+            super().paginate_queryset(queryset, page_size)
+        )
+        page.object_list = attach_categories_and_locations(list(object_list))
+        return paginator, page, page.object_list, is_paginated
 
 
 class ReverseToPostPageMixin:
@@ -1,13 +1,17 @@
 from django.contrib.auth import get_user_model
 from django.db import models
 from django.utils import timezone
+from django.utils.text import Truncator
 
 from core.constants import (
+    EXCERPT_WORDS,
     MAX_CAT_TITLE_LENGTH,
     MAX_COMMENT_LENGTH,
     MAX_TEXT_LENGTH
 )
-from core.models import CreatedAtModel, PublishedModel
+from core.models import CreatedAtModel, PublishedModel, UpdatedAtModel
+
+from .deletions import group_comment_deletes
 
 
 User = get_user_model()
@@ -24,13 +28,19 @@ class PublishedPostsAndRelatedTablesMangager(models.Manager):
         )
 
 
-class Post(PublishedModel, CreatedAtModel):
+class Post(PublishedModel, CreatedAtModel, UpdatedAtModel):
     title = models.CharField(
         max_length=MAX_TEXT_LENGTH,
         blank=False,
         verbose_name='Заголовок'
     )
     text = models.TextField(blank=False, verbose_name='Текст')
+    excerpt = models.CharField(
+        max_length=MAX_TEXT_LENGTH,
+        blank=True,
+        editable=False,
+        verbose_name='Анонс'
+    )
     pub_date = models.DateTimeField(
         blank=False,
         verbose_name='Дата и время публикации',
@@ -49,6 +59,17 @@ class Post(PublishedModel, CreatedAtModel):
         verbose_name='Фото',
         upload_to='post_images'
     )
+    image_renditions = models.JSONField(
+        default=list,
+        blank=True,
+        editable=False,
+        verbose_name='Уменьшенные копии фото'
+    )
+    image_processing = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Фото обрабатывается'
+    )
     location = models.ForeignKey(
         'Location',
         blank=True,
@@ -63,6 +84,11 @@ class Post(PublishedModel, CreatedAtModel):
         related_name='posts',
         verbose_name='Категория'
     )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев'
+    )
     objects = models.Manager()
     public_posts = PublishedPostsAndRelatedTablesMangager()
 
@@ -70,10 +96,52 @@ class Post(PublishedModel, CreatedAtModel):
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('pub_date',),
+                name='post_published_pub_date_idx',
+                condition=models.Q(is_published=True)
+            ),
+            models.Index(
+                fields=('category', 'pub_date'),
+                name='post_category_pub_date_idx'
+            ),
+            models.Index(
+                fields=('author', 'pub_date'),
+                name='post_author_pub_date_idx'
+            ),
+            models.Index(
+                fields=('image',),
+                name='post_image_idx',
+                condition=~models.Q(image='')
+            ),
+        )
 
     def __str__(self):
         return self.title
 
+    @staticmethod
+    def make_excerpt(text):
+        return Truncator(
+            Truncator(text).words(EXCERPT_WORDS, truncate=' …')
+        ).chars(MAX_TEXT_LENGTH)
+
+    def save(self, *args, **kwargs):
+        if 'text' not in self.get_deferred_fields():
+            self.excerpt = self.make_excerpt(self.text)
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'text' in update_fields:
+                kwargs['update_fields'] = {*update_fields, 'excerpt'}
+        super().save(*args, **kwargs)
+
+    def is_visible_to(self, user):
+        return self.author_id == user.pk or (
+            self.is_published
+            and self.pub_date <= timezone.now()
+            and self.category is not None
+            and self.category.is_published
+        )
+
 
 class Category(PublishedModel, CreatedAtModel):
     title = models.CharField(
@@ -96,6 +164,12 @@ class Category(PublishedModel, CreatedAtModel):
     class Meta(CreatedAtModel.Meta):
         verbose_name = 'категория'
         verbose_name_plural = 'Категории'
+        indexes = (
+            models.Index(
+                fields=('is_published',),
+                name='category_is_published_idx'
+            ),
+        )
 
     def __str__(self):
         return self.title[:MAX_CAT_TITLE_LENGTH]
@@ -116,7 +190,13 @@ class Location(PublishedModel, CreatedAtModel):
         return self.name
 
 
-class Comment(CreatedAtModel):
+class CommentQuerySet(models.QuerySet):
+    def delete(self):
+        with group_comment_deletes(self.model):
+            return super().delete()
+
+
+class Comment(CreatedAtModel, UpdatedAtModel):
     text = models.TextField(verbose_name='Текст комментария')
     post = models.ForeignKey(
         Post,
@@ -133,12 +213,70 @@ class Comment(CreatedAtModel):
         verbose_name='Добавлено'
     )
 
+    objects = CommentQuerySet.as_manager()
+
     class Meta(CreatedAtModel.Meta):
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_at_idx'
+            ),
+        )
 
     def __str__(self):
         return (
             f'Комментарий пользователя {self.author} '
             f'к посту "{self.post}": {self.text:.{MAX_COMMENT_LENGTH}}...'
         )
+
+
+class ImageTask(CreatedAtModel):
+    """Задача очереди на создание уменьшенных копий фото публикации."""
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'В очереди'
+        PROCESSING = 'processing', 'Обрабатывается'
+        DONE = 'done', 'Готово'
+        FAILED = 'failed', 'Ошибка'
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='image_tasks',
+        verbose_name='Публикация'
+    )
+    image = models.CharField(
+        max_length=MAX_TEXT_LENGTH,
+        verbose_name='Файл фото'
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name='Статус'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток'
+    )
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Начата'
+    )
+    error = models.TextField(blank=True, verbose_name='Ошибка')
+
+    class Meta(CreatedAtModel.Meta):
+        verbose_name = 'задача обработки фото'
+        verbose_name_plural = 'Задачи обработки фото'
+        indexes = (
+            models.Index(
+                fields=('status', 'created_at'),
+                name='imagetask_status_created_idx'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.image} ({self.get_status_display()})'
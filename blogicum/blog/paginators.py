@@ -0,0 +1,179 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage, Paginator
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+
+from core.constants import COUNT_CACHE_TIMEOUT
+
+from .cache import get_cache, make_key
+
+
+class CachedCountPaginator(Paginator):
+    """Пагинатор, который кэширует COUNT(*) по тегам ленты.
+
+    С `count_limit` подсчёт ограничивается первыми `count_limit`
+    строками: дальше по ленте переходят курсорной пагинацией.
+    """
+
+    def __init__(self, object_list, per_page, cache_tags=(), cache_parts=(),
+                 count_limit=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.cache_tags = cache_tags
+        self.cache_parts = cache_parts
+        self.count_limit = count_limit
+
+    @cached_property
+    def count(self):
+        cache = get_cache()
+        key = make_key(
+            'count', self.cache_tags, self.count_limit, *self.cache_parts
+        )
+        count = cache.get(key)
+        if count is None:
+            queryset = self.object_list
+            if (
+                self.count_limit is not None
+                and isinstance(queryset, QuerySet)
+            ):
+                queryset = queryset[:self.count_limit]
+            count = queryset.count()
+            cache.set(key, count, COUNT_CACHE_TIMEOUT)
+        return count
+
+    @property
+    def is_approximate(self):
+        return self.count_limit is not None and self.count >= self.count_limit
+
+
+class KeysetPage:
+    """Страница курсорной пагинации."""
+
+    is_keyset = True
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f'<KeysetPage of {len(self)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if not self._has_next:
+            return None
+        return self.paginator.encode_cursor(self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if not self._has_previous:
+            return None
+        return self.paginator.encode_cursor(self.object_list[0])
+
+
+class KeysetPaginator:
+    """Пагинатор по ключу сортировки вместо OFFSET.
+
+    Курсор хранит значения полей сортировки граничного объекта, поэтому
+    стоимость запроса не зависит от глубины страницы и не требует COUNT(*).
+    Последнее поле сортировки должно быть уникальным.
+    """
+
+    def __init__(self, object_list, per_page, ordering=('-pub_date', '-id')):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.fields = [
+            object_list.model._meta.get_field(name.lstrip('-'))
+            for name in self.ordering
+        ]
+
+    def encode_cursor(self, obj):
+        values = [
+            self._serialize(getattr(obj, field.attname))
+            for field in self.fields
+        ]
+        return base64.urlsafe_b64encode(
+            json.dumps(values).encode()
+        ).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(
+                cursor + '=' * (-len(cursor) % 4)
+            ))
+            if len(values) != len(self.fields) or None in values:
+                raise ValueError
+            return [
+                field.to_python(value)
+                for field, value in zip(self.fields, values)
+            ]
+        except (binascii.Error, TypeError, ValueError, ValidationError):
+            raise InvalidPage('Некорректный курсор страницы.')
+
+    def page(self, after=None, before=None):
+        """Возвращает страницу после курсора `after` или перед `before`.
+
+        Пустой курсор `after` означает первую страницу.
+        """
+        if before:
+            queryset = self.object_list.filter(
+                self._boundary(self.decode_cursor(before), reverse=True)
+            ).order_by(*self._reversed_ordering())
+            rows = list(queryset[:self.per_page + 1])
+            has_previous = len(rows) > self.per_page
+            rows = rows[:self.per_page][::-1]
+            return KeysetPage(rows, self, True, has_previous)
+        queryset = self.object_list.order_by(*self.ordering)
+        if after:
+            queryset = queryset.filter(
+                self._boundary(self.decode_cursor(after))
+            )
+        rows = list(queryset[:self.per_page + 1])
+        has_next = len(rows) > self.per_page
+        return KeysetPage(rows[:self.per_page], self, has_next, bool(after))
+
+    def _boundary(self, values, reverse=False):
+        condition = Q()
+        equal = {}
+        for name, field, value in zip(self.ordering, self.fields, values):
+            descending = name.startswith('-') != reverse
+            lookup = 'lt' if descending else 'gt'
+            condition |= Q(**equal, **{f'{field.attname}__{lookup}': value})
+            equal[field.attname] = value
+        return condition
+
+    def _reversed_ordering(self):
+        return [
+            name[1:] if name.startswith('-') else f'-{name}'
+            for name in self.ordering
+        ]
+
+    @staticmethod
+    def _serialize(value):
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        return value
@@ -0,0 +1,67 @@
+from time import monotonic
+
+from core.constants import REGISTRY_TIMEOUT
+
+from .cache import bump, get_versions
+from .models import Category, Location, Post
+
+
+class ModelRegistry:
+    """Копия небольшой, редко меняющейся таблицы в памяти процесса.
+
+    Изменение строки меняет версию в кэше PAGE_CACHE_ALIAS, и процесс
+    перечитывает таблицу при следующем обращении. Если этот кэш не общий
+    (locmem), другие процессы узнают об изменении только через
+    REGISTRY_TIMEOUT секунд.
+    """
+
+    def __init__(self, model, tag):
+        self.model = model
+        self.tag = tag
+        self._version = None
+        self._loaded_at = None
+        self._objects = {}
+        self._indexes = {}
+
+    def _actual(self):
+        version, = get_versions((self.tag,))
+        now = monotonic()
+        if version != self._version or (
+            now - self._loaded_at >= REGISTRY_TIMEOUT
+        ):
+            self._objects = {obj.pk: obj for obj in self.model.objects.all()}
+            self._indexes = {}
+            self._version = version
+            self._loaded_at = now
+        return self._objects
+
+    def get(self, pk):
+        return self._actual().get(pk)
+
+    def all(self):
+        return self._actual().values()
+
+    def lookup(self, field, value):
+        objects = self._actual()
+        if field not in self._indexes:
+            self._indexes[field] = {
+                getattr(obj, field): obj for obj in objects.values()
+            }
+        return self._indexes[field].get(value)
+
+    def invalidate(self):
+        bump(self.tag)
+
+
+categories = ModelRegistry(Category, 'registry:category')
+locations = ModelRegistry(Location, 'registry:location')
+
+
+def attach_categories_and_locations(posts):
+    """Подставляет категории и местоположения постов из памяти."""
+    category_field = Post._meta.get_field('category')
+    location_field = Post._meta.get_field('location')
+    for post in posts:
+        category_field.set_cached_value(post, categories.get(post.category_id))
+        location_field.set_cached_value(post, locations.get(post.location_id))
+    return posts
@@ -0,0 +1,42 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from ..utils import public_feed_posts
+from .base import RankedResults, SearchBackend
+from .fts5 import FTS5Backend
+from .inverted import InvertedIndexBackend
+
+__all__ = [
+    'FTS5Backend',
+    'InvertedIndexBackend',
+    'RankedResults',
+    'SearchBackend',
+    'get_backend',
+    'search_posts',
+]
+
+
+@lru_cache(maxsize=None)
+def get_backend():
+    """Движок из настройки SEARCH_BACKEND.
+
+    'auto' выбирает FTS5, если SQLite собран с ним, иначе встроенный
+    инвертированный индекс.
+    """
+    name = settings.SEARCH_BACKEND
+    if name in ('auto', 'fts5'):
+        backend = FTS5Backend()
+        if name == 'fts5' or backend.is_available():
+            return backend
+    elif name != 'inverted':
+        raise ImproperlyConfigured(
+            f'Неизвестный движок поиска SEARCH_BACKEND={name!r}.'
+        )
+    return InvertedIndexBackend(settings.SEARCH_INDEX_DIR)
+
+
+def search_posts(query):
+    """Опубликованные посты, подходящие под запрос, лучшие первыми."""
+    return get_backend().search(query, public_feed_posts())
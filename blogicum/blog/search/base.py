@@ -0,0 +1,62 @@
+from django.utils.functional import cached_property
+
+
+class SearchBackend:
+    """Интерфейс поискового движка публикаций."""
+
+    # Индекс меняется в той же транзакции базы данных, что и посты.
+    transactional = True
+
+    def is_available(self):
+        return True
+
+    def index_post(self, post):
+        raise NotImplementedError
+
+    def remove_post(self, post_id):
+        raise NotImplementedError
+
+    def rebuild(self):
+        raise NotImplementedError
+
+    def search(self, query, posts):
+        """Сужает `posts` до подходящих под запрос, лучшие первыми."""
+        raise NotImplementedError
+
+
+class RankedResults:
+    """Результаты поиска в порядке ранжирования движка.
+
+    Видимость постов проверяется одним запросом по id кандидатов,
+    а сами объекты загружаются только для запрошенного среза.
+    """
+
+    def __init__(self, ids, posts):
+        self.ids = ids
+        self.posts = posts
+        self.model = posts.model
+
+    @cached_property
+    def visible_ids(self):
+        if not self.ids:
+            return []
+        visible = set(
+            self.posts.filter(pk__in=self.ids).values_list('pk', flat=True)
+        )
+        return [pk for pk in self.ids if pk in visible]
+
+    def count(self):
+        return len(self.visible_ids)
+
+    def __len__(self):
+        return self.count()
+
+    def __iter__(self):
+        return iter(self[:])
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1 or None][0]
+        ids = self.visible_ids[index]
+        posts = self.posts.in_bulk(ids)
+        return [posts[pk] for pk in ids if pk in posts]
@@ -0,0 +1,73 @@
+import re
+
+from django.db import connection
+from django.utils.functional import cached_property
+
+from .base import SearchBackend
+
+
+FTS_TABLE = 'blog_post_fts'
+TOKEN_RE = re.compile(r'\w+')
+
+
+def to_match_expression(query):
+    """Превращает ввод пользователя в запрос FTS5 из слов-префиксов."""
+    return ' '.join(f'"{token}"*' for token in TOKEN_RE.findall(query))
+
+
+class FTS5Backend(SearchBackend):
+    """Поиск через виртуальную таблицу FTS5 в SQLite."""
+
+    @cached_property
+    def available(self):
+        return (
+            connection.vendor == 'sqlite'
+            and FTS_TABLE in connection.introspection.table_names()
+        )
+
+    def is_available(self):
+        return self.available
+
+    def index_post(self, post):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post.pk]
+            )
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+                'VALUES (%s, %s, %s)',
+                [post.pk, post.title, post.text]
+            )
+
+    def remove_post(self, post_id):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post_id]
+            )
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+                'SELECT id, title, text FROM blog_post'
+            )
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES (%s)',
+                ['optimize']
+            )
+
+    def search(self, query, posts):
+        expression = to_match_expression(query)
+        if not expression:
+            return posts.none()
+        return posts.extra(
+            tables=[FTS_TABLE],
+            where=[
+                f'{FTS_TABLE}.rowid = blog_post.id',
+                f'{FTS_TABLE} MATCH %s'
+            ],
+            params=[expression],
+            select={'search_rank': f'bm25({FTS_TABLE}, 2.0, 1.0)'},
+            order_by=['search_rank', '-pub_date']
+        )
@@ -0,0 +1,383 @@
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import threading
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from core.constants import MAX_SEARCH_RESULTS
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from ..models import Post
+from .base import RankedResults, SearchBackend
+from .stemmer import stem
+
+
+TOKEN_RE = re.compile(r'\w+')
+TITLE_WEIGHT = 2
+MAX_TERM_FREQUENCY = 0xFFFF
+
+# Снимок: заголовок, каталог терминов (отсортирован по байтам UTF-8),
+# байты терминов и списки вхождений. Список вхождений термина разбит
+# на сегменты по частоте термина в посте: таблица (частота, длина)
+# по убыванию частоты, затем id постов каждого сегмента по возрастанию
+# (uint32, порядок байтов — как у платформы).
+MAGIC = b'BLGIDX02'
+HEADER = struct.Struct('<8sII')
+ENTRY = struct.Struct('<QHQH')
+SEGMENT = struct.Struct('<HI')
+
+
+def tokenize(text):
+    return [stem(token) for token in TOKEN_RE.findall(text.lower())]
+
+
+def term_frequencies(title, text):
+    counts = Counter(tokenize(text))
+    for term in tokenize(title):
+        counts[term] += TITLE_WEIGHT
+    return {
+        term: min(count, MAX_TERM_FREQUENCY)
+        for term, count in counts.items()
+    }
+
+
+def term_weight(frequency, idf):
+    return (1 + math.log(frequency)) * idf
+
+
+def write_snapshot(path, postings, doc_count):
+    """Атомарно записывает снимок из {термин: {частота: ids}}."""
+    terms = sorted(postings, key=str.encode)
+    encoded = [term.encode() for term in terms]
+    segments = [
+        sorted(postings[term].items(), reverse=True) for term in terms
+    ]
+    term_offset = HEADER.size + ENTRY.size * len(terms)
+    postings_offset = term_offset + sum(map(len, encoded))
+    temporary = path.with_suffix('.tmp')
+    with open(temporary, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, len(terms), doc_count))
+        for term_bytes, term_segments in zip(encoded, segments):
+            file.write(ENTRY.pack(
+                term_offset, len(term_bytes),
+                postings_offset, len(term_segments)
+            ))
+            term_offset += len(term_bytes)
+            postings_offset += sum(
+                SEGMENT.size + len(ids) * ids.itemsize
+                for _, ids in term_segments
+            )
+        for term_bytes in encoded:
+            file.write(term_bytes)
+        for term_segments in segments:
+            for frequency, ids in term_segments:
+                file.write(SEGMENT.pack(frequency, len(ids)))
+            for _, ids in term_segments:
+                file.write(ids.tobytes())
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+
+class Snapshot:
+    """Снимок индекса на диске, отображённый в память.
+
+    Термины ищутся двоичным поиском прямо по mmap, так что открытие
+    снимка не зависит от размера словаря.
+    """
+
+    def __init__(self, path=None):
+        self.identity = None
+        self.term_count = self.doc_count = 0
+        self._map = None
+        if path is None:
+            return
+        try:
+            file = open(path, 'rb')
+        except FileNotFoundError:
+            return
+        with file:
+            stat = os.fstat(file.fileno())
+            self.identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if not stat.st_size:
+                return
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.term_count, self.doc_count = HEADER.unpack_from(
+            self._map
+        )
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f'{path} не является снимком поискового индекса.')
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self.term_count = self.doc_count = 0
+
+    def postings(self, term):
+        """Сегменты [(частота, ids)] термина по убыванию частоты."""
+        entry = self._find(term.encode())
+        if entry is None:
+            return []
+        offset, count = entry
+        table = [
+            SEGMENT.unpack_from(self._map, offset + index * SEGMENT.size)
+            for index in range(count)
+        ]
+        offset += count * SEGMENT.size
+        segments = []
+        for frequency, length in table:
+            ids = array('I')
+            ids.frombytes(self._map[offset:offset + length * ids.itemsize])
+            offset += length * ids.itemsize
+            segments.append((frequency, ids))
+        return segments
+
+    def _find(self, key):
+        low, high = 0, self.term_count
+        while low < high:
+            middle = (low + high) // 2
+            term_offset, length, offset, count = ENTRY.unpack_from(
+                self._map, HEADER.size + middle * ENTRY.size
+            )
+            term = self._map[term_offset:term_offset + length]
+            if term < key:
+                low = middle + 1
+            elif term > key:
+                high = middle
+            else:
+                return offset, count
+        return None
+
+
+def lock_file(file):
+    """Блокирует файл между процессами до его закрытия."""
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+
+
+class InvertedIndexBackend(SearchBackend):
+    """Встроенный инвертированный индекс для SQLite без FTS5.
+
+    Снимок перестраивается командой rebuild_search_index, а изменения
+    постов между перестроениями дописываются в журнал. Каждый процесс
+    перед поиском дочитывает журнал, поэтому индекс общий для воркеров.
+    """
+
+    transactional = False
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.snapshot_path = self.directory / 'snapshot.bin'
+        self.journal_path = self.directory / 'journal.log'
+        self.snapshot = Snapshot()
+        self._journal_id = None
+        self._journal_offset = 0
+        self._lock = threading.Lock()
+        self._reset_changes()
+
+    def index_post(self, post):
+        self._append(post.pk, term_frequencies(post.title, post.text))
+
+    def remove_post(self, post_id):
+        self._append(post_id, None)
+
+    def rebuild(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Записи журнала после этой отметки могут не попасть в снимок.
+        with open(self.journal_path, 'ab') as journal:
+            lock_file(journal)
+            start = os.fstat(journal.fileno()).st_size
+        postings = defaultdict(lambda: defaultdict(lambda: array('I')))
+        doc_count = 0
+        rows = Post.objects.order_by('pk').values_list(
+            'pk', 'title', 'text'
+        ).iterator()
+        for pk, title, text in rows:
+            doc_count += 1
+            for term, frequency in term_frequencies(title, text).items():
+                postings[term][frequency].append(pk)
+        with self._lock:
+            write_snapshot(self.snapshot_path, postings, doc_count)
+            self._rotate_journal(start)
+
+    def _rotate_journal(self, start):
+        """Оставляет в журнале только записи, сделанные с начала перестроения.
+
+        Журнал заменяется новым файлом; процессы, ожидавшие блокировку
+        старого, замечают замену в _append() и пишут в новый.
+        """
+        temporary = self.journal_path.with_suffix('.tmp')
+        with open(self.journal_path, 'ab+') as journal:
+            lock_file(journal)
+            journal.seek(start)
+            with open(temporary, 'wb') as rotated:
+                rotated.write(journal.read())
+            os.replace(temporary, self.journal_path)
+
+    def search(self, query, posts):
+        terms = set(tokenize(query))
+        if not terms:
+            return posts.none()
+        return RankedResults(self.rank(terms), posts)
+
+    def rank(self, terms, limit=MAX_SEARCH_RESULTS):
+        """Id постов, содержащих все термины, по убыванию TF-IDF."""
+        with self._lock:
+            self._sync()
+            return self._rank(terms, limit)
+
+    def _rank(self, terms, limit):
+        doc_count = self.snapshot.doc_count + len(self._docs)
+        lists = []
+        for term in terms:
+            segments = self.snapshot.postings(term)
+            changed = self._terms.get(term, frozenset())
+            df = sum(len(ids) for _, ids in segments) + len(changed)
+            if not df:
+                return []
+            idf = math.log(1 + doc_count / df)
+            lists.append((df, term, idf, [
+                (term_weight(frequency, idf), ids)
+                for frequency, ids in segments
+            ], changed))
+        lists.sort(key=lambda item: item[0])
+
+        # Куча из `limit` лучших пар (вес, id): больший id — новее пост.
+        best = []
+
+        def offer(score, pk):
+            if len(best) < limit:
+                heapq.heappush(best, (score, pk))
+            elif (score, pk) > best[0]:
+                heapq.heapreplace(best, (score, pk))
+
+        for pk in frozenset.intersection(
+            *(frozenset(changed) for *_, changed in lists)
+        ):
+            offer(sum(
+                term_weight(self._docs[pk][term], idf)
+                for _, term, idf, _, _ in lists
+            ), pk)
+
+        (_, _, _, driving, _), *others = lists
+        others = [segments for _, _, _, segments, _ in others]
+        if all(others):
+            rest = sum(segments[0][0] for segments in others)
+            self._scan(driving, others, rest, limit, best, offer)
+        return [pk for _, pk in sorted(best, reverse=True)]
+
+    def _scan(self, driving, others, rest, limit, best, offer):
+        """Обходит самый короткий список от лучших сегментов к худшим.
+
+        Внутри сегмента посты идут от новых к старым, поэтому обход
+        останавливается, как только ни один оставшийся пост не может
+        попасть в первые `limit`.
+        """
+        for weight, ids in driving:
+            bound = weight + rest
+            if len(best) == limit and best[0] >= (bound, ids[-1]):
+                return
+            for index in range(len(ids) - 1, -1, -1):
+                pk = ids[index]
+                if pk in self._docs:
+                    continue
+                score = weight
+                for segments in others:
+                    found = self._lookup(segments, pk)
+                    if found is None:
+                        break
+                    score += found
+                else:
+                    offer(score, pk)
+                if len(best) == limit and best[0] >= (bound, pk):
+                    return
+
+    @staticmethod
+    def _lookup(segments, pk):
+        for weight, ids in segments:
+            index = bisect_left(ids, pk)
+            if index < len(ids) and ids[index] == pk:
+                return weight
+        return None
+
+    def _reset_changes(self):
+        # Посты, изменённые после снимка: id -> {термин: частота} или None
+        # для удалённых. Их вхождения в снимке не учитываются.
+        self._docs = {}
+        self._terms = defaultdict(set)
+
+    def _apply(self, pk, frequencies):
+        for term in self._docs.get(pk) or ():
+            self._terms[term].discard(pk)
+        self._docs[pk] = frequencies
+        for term in frequencies or ():
+            self._terms[term].add(pk)
+
+    def _append(self, pk, frequencies):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        line = json.dumps([pk, frequencies], ensure_ascii=False)
+        while True:
+            with open(self.journal_path, 'ab') as journal:
+                lock_file(journal)
+                if self._is_current_journal(journal):
+                    journal.write(line.encode() + b'\n')
+                    return
+
+    def _is_current_journal(self, journal):
+        try:
+            current = os.stat(self.journal_path).st_ino
+        except FileNotFoundError:
+            return False
+        return os.fstat(journal.fileno()).st_ino == current
+
+    def _sync(self):
+        """Подхватывает новый снимок и дочитывает журнал."""
+        try:
+            stat = os.stat(self.snapshot_path)
+            identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            identity = None
+        try:
+            journal = open(self.journal_path, 'rb')
+        except FileNotFoundError:
+            journal = None
+        try:
+            # Размер и inode берутся у открытого файла: журнал могут
+            # заменить между проверкой и чтением.
+            stat = journal and os.fstat(journal.fileno())
+            journal_id = stat.st_ino if stat else None
+            journal_size = stat.st_size if stat else 0
+            if (
+                identity != self.snapshot.identity
+                or journal_id != self._journal_id
+                or journal_size < self._journal_offset
+            ):
+                self.snapshot.close()
+                self.snapshot = Snapshot(self.snapshot_path)
+                self._reset_changes()
+                self._journal_id = journal_id
+                self._journal_offset = 0
+            if journal_size == self._journal_offset:
+                return
+            journal.seek(self._journal_offset)
+            data = journal.read(journal_size - self._journal_offset)
+        finally:
+            if journal is not None:
+                journal.close()
+        complete = data[:data.rfind(b'\n') + 1]
+        for line in complete.splitlines():
+            self._apply(*json.loads(line))
+        self._journal_offset += len(complete)
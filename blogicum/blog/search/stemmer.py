@@ -0,0 +1,107 @@
+"""Стеммер Портера (Snowball) для русского языка."""
+
+from functools import lru_cache
+
+
+VOWELS = frozenset('аеиоуыэюя')
+
+# Суффиксы первой группы отсекаются, только если перед ними «а» или «я».
+PERFECTIVE_GERUND = (
+    ('вшись', 'вши', 'в'),
+    ('ывшись', 'ившись', 'ывши', 'ивши', 'ыв', 'ив'),
+)
+REFLEXIVE = ((), ('ся', 'сь'))
+ADJECTIVE = ((), (
+    'ими', 'ыми', 'его', 'ого', 'ему', 'ому', 'ее', 'ие', 'ые', 'ое', 'ей',
+    'ий', 'ый', 'ой', 'ем', 'им', 'ым', 'ом', 'их', 'ых', 'ую', 'юю', 'ая',
+    'яя', 'ою', 'ею',
+))
+PARTICIPLE = (
+    ('ем', 'нн', 'вш', 'ющ', 'щ'),
+    ('ивш', 'ывш', 'ующ'),
+)
+VERB = (
+    ('ла', 'на', 'ете', 'йте', 'ли', 'й', 'л', 'ем', 'н', 'ло', 'но', 'ет',
+     'ют', 'ны', 'ть', 'ешь', 'нно'),
+    ('ила', 'ыла', 'ена', 'ейте', 'уйте', 'ите', 'или', 'ыли', 'ей', 'уй',
+     'ил', 'ыл', 'им', 'ым', 'ен', 'ило', 'ыло', 'ено', 'ят', 'ует', 'уют',
+     'ит', 'ыт', 'ены', 'ить', 'ыть', 'ишь', 'ую', 'ю'),
+)
+NOUN = ((), (
+    'иями', 'ями', 'ами', 'иях', 'ией', 'ием', 'иям', 'ев', 'ов', 'ие', 'ье',
+    'еи', 'ии', 'ей', 'ой', 'ий', 'ям', 'ем', 'ам', 'ом', 'ах', 'ях', 'ию',
+    'ью', 'ия', 'ья', 'а', 'е', 'и', 'й', 'о', 'у', 'ы', 'ь', 'ю', 'я',
+))
+SUPERLATIVE = ((), ('ейше', 'ейш'))
+DERIVATIONAL = ((), ('ость', 'ост'))
+
+
+def _region_after_vowel_pair(word, start):
+    """Начало области после первой согласной, следующей за гласной."""
+    for i in range(start + 1, len(word)):
+        if word[i] not in VOWELS and word[i - 1] in VOWELS:
+            return i + 1
+    return len(word)
+
+
+def _strip(word, start, groups):
+    """Отсекает самый длинный суффикс из `groups`, лежащий за `start`.
+
+    Возвращает None, если подходящего суффикса нет.
+    """
+    conditional, plain = groups
+    best = None
+    for suffix in (*conditional, *plain):
+        if (
+            word.endswith(suffix)
+            and len(word) - len(suffix) >= start
+            and (best is None or len(suffix) > len(best))
+        ):
+            best = suffix
+    if best is None:
+        return None
+    cut = len(word) - len(best)
+    if best in conditional and best not in plain:
+        if cut - 1 < start or word[cut - 1] not in 'ая':
+            return None
+    return word[:cut]
+
+
+# Словарь намного меньше числа слов в текстах, поэтому основы кэшируются.
+@lru_cache(maxsize=100_000)
+def stem(word):
+    word = word.lower().replace('ё', 'е')
+    rv = next(
+        (i + 1 for i, letter in enumerate(word) if letter in VOWELS),
+        len(word)
+    )
+    r2 = _region_after_vowel_pair(word, _region_after_vowel_pair(word, 0))
+
+    stripped = _strip(word, rv, PERFECTIVE_GERUND)
+    if stripped is None:
+        word = _strip(word, rv, REFLEXIVE) or word
+        stripped = _strip(word, rv, ADJECTIVE)
+        if stripped is not None:
+            stripped = _strip(stripped, rv, PARTICIPLE) or stripped
+        else:
+            stripped = _strip(word, rv, VERB)
+            if stripped is None:
+                stripped = _strip(word, rv, NOUN)
+    if stripped is not None:
+        word = stripped
+
+    if word.endswith('и') and len(word) - 1 >= rv:
+        word = word[:-1]
+
+    word = _strip(word, r2, DERIVATIONAL) or word
+
+    if word.endswith('нн') and len(word) - 2 >= rv:
+        return word[:-1]
+    stripped = _strip(word, rv, SUPERLATIVE)
+    if stripped is not None:
+        if stripped.endswith('нн') and len(stripped) - 2 >= rv:
+            stripped = stripped[:-1]
+        return stripped
+    if word.endswith('ь') and len(word) - 1 >= rv:
+        return word[:-1]
+    return word
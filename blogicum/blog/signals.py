@@ -0,0 +1,247 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import (
+    post_delete,
+    post_init,
+    post_save,
+    pre_delete
+)
+from django.dispatch import receiver
+
+from core.constants import USER
+
+from .cache import (
+    GLOBAL_TAG,
+    INDEX_TAG,
+    bump,
+    category_tag,
+    post_tag,
+    profile_tag,
+    reset_next_publication
+)
+from .deletions import comments_deleted, deleting_posts, grouped_comment_counts
+from .images import release_image
+from .models import Category, Comment, Location, Post
+from .registry import categories, locations
+from .search import get_backend
+
+
+def bump_post_pages(post_id, slugs, usernames):
+    bump(
+        INDEX_TAG,
+        post_tag(post_id),
+        *map(category_tag, slugs),
+        *map(profile_tag, usernames)
+    )
+
+
+@receiver(post_save, sender=Comment)
+def increase_comment_count(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1
+        )
+
+
+@receiver(pre_delete, sender=Post)
+def mark_deleting_post(sender, instance, **kwargs):
+    deleting_posts().add(instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+def unmark_deleting_post(sender, instance, **kwargs):
+    deleting_posts().discard(instance.pk)
+
+
+def is_grouped_delete(comment):
+    """Комментарий удаляется вместе с постом или в массовом удалении."""
+    return (
+        grouped_comment_counts() is not None
+        or comment.post_id in deleting_posts()
+    )
+
+
+@receiver(post_delete, sender=Comment)
+def count_grouped_comment(sender, instance, **kwargs):
+    counts = grouped_comment_counts()
+    if counts is not None:
+        counts[instance.post_id] += 1
+
+
+@receiver(post_delete, sender=Comment)
+def decrease_comment_count(sender, instance, **kwargs):
+    if is_grouped_delete(instance):
+        return
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1
+    )
+
+
+@receiver(comments_deleted, sender=Comment)
+def decrease_comment_counts(sender, counts, **kwargs):
+    for post_id, count in counts.items():
+        Post.objects.filter(pk=post_id).update(
+            comment_count=Greatest(F('comment_count') - count, 0)
+        )
+
+
+@receiver(post_init, sender=Post)
+def remember_post_category(sender, instance, **kwargs):
+    instance._original_category_id = instance.__dict__.get('category_id')
+
+
+@receiver(post_init, sender=Post)
+def remember_post_image(sender, instance, **kwargs):
+    image = instance.__dict__.get('image')
+    instance._original_image = getattr(image, 'name', image)
+    instance._original_renditions = instance.__dict__.get('image_renditions')
+
+
+@receiver(post_save, sender=Post)
+def release_replaced_image(sender, instance, **kwargs):
+    if 'image' not in instance.__dict__:
+        return
+    name, renditions = (
+        instance._original_image, instance._original_renditions
+    )
+    if name and name != instance.image.name:
+        transaction.on_commit(
+            lambda: release_image(name, renditions, instance.image.storage)
+        )
+    instance._original_image = instance.image.name
+    instance._original_renditions = instance.image_renditions
+
+
+@receiver(post_save, sender=Post)
+def settle_saved_image(sender, instance, **kwargs):
+    if 'image' not in instance.__dict__ or not instance.image:
+        return
+    name, storage = instance.image.name, instance.image.storage
+    transaction.on_commit(lambda: storage.settle(name))
+
+
+@receiver(post_delete, sender=Post)
+def release_deleted_image(sender, instance, **kwargs):
+    if 'image' not in instance.__dict__:
+        return
+    name = instance.image.name
+    renditions = instance.__dict__.get('image_renditions')
+    transaction.on_commit(
+        lambda: release_image(name, renditions, instance.image.storage)
+    )
+
+
+@receiver((post_save, post_delete), sender=Post)
+def invalidate_post_pages(sender, instance, **kwargs):
+    category_ids = {instance.category_id, instance._original_category_id}
+    slugs = Category.objects.filter(
+        pk__in=category_ids - {None}
+    ).values_list('slug', flat=True)
+    usernames = USER.objects.filter(
+        pk=instance.author_id
+    ).values_list('username', flat=True)
+    bump_post_pages(instance.pk, slugs, usernames)
+    reset_next_publication()
+    instance._original_category_id = instance.category_id
+
+
+def change_search_index(change):
+    """Меняет индекс поиска вместе с транзакцией базы данных.
+
+    Нетранзакционный движок меняется только после фиксации: иначе
+    откаченная правка осталась бы в индексе до его перестроения.
+    """
+    backend = get_backend()
+    if not backend.is_available():
+        return
+    if backend.transactional:
+        change(backend)
+    else:
+        transaction.on_commit(lambda: change(backend))
+
+
+@receiver(post_save, sender=Post)
+def update_search_index(sender, instance, update_fields, **kwargs):
+    if update_fields is not None and not {'title', 'text'} & update_fields:
+        return
+    change_search_index(lambda backend: backend.index_post(instance))
+
+
+@receiver(post_delete, sender=Post)
+def remove_from_search_index(sender, instance, **kwargs):
+    post_id = instance.pk
+    change_search_index(lambda backend: backend.remove_post(post_id))
+
+
+@receiver(post_init, sender=USER)
+def remember_username(sender, instance, **kwargs):
+    instance._original_username = instance.__dict__.get('username')
+
+
+@receiver(post_save, sender=USER)
+def invalidate_author_pages(sender, instance, created, update_fields,
+                            **kwargs):
+    if created or update_fields == frozenset({'last_login'}):
+        return
+    original = instance._original_username
+    tags = {profile_tag(instance.username), profile_tag(original)}
+    if original != instance.username:
+        # Имя автора выводится в карточках, комментариях и лентах.
+        tags.add(GLOBAL_TAG)
+    bump(*tags)
+    instance._original_username = instance.username
+
+
+@receiver((post_save, post_delete), sender=Comment)
+def invalidate_comment_pages(sender, instance, signal, created=False,
+                             **kwargs):
+    if signal is post_save and not created:
+        bump(post_tag(instance.post_id))
+        return
+    if signal is post_delete and is_grouped_delete(instance):
+        return
+    related = Post.objects.filter(pk=instance.post_id).values_list(
+        'category__slug', 'author__username'
+    ).first()
+    if related is None:
+        bump(post_tag(instance.post_id))
+        return
+    slug, username = related
+    bump_post_pages(instance.post_id, {slug} - {None}, (username,))
+
+
+@receiver(comments_deleted, sender=Comment)
+def invalidate_grouped_comment_pages(sender, counts, **kwargs):
+    if not counts:
+        return
+    related = Post.objects.filter(pk__in=counts).values_list(
+        'category__slug', 'author__username'
+    )
+    slugs = set()
+    usernames = set()
+    for slug, username in related:
+        slugs.add(slug)
+        usernames.add(username)
+    bump(
+        INDEX_TAG,
+        *map(post_tag, counts),
+        *map(category_tag, slugs - {None}),
+        *map(profile_tag, usernames)
+    )
+
+
+@receiver((post_save, post_delete), sender=Category)
+@receiver((post_save, post_delete), sender=Location)
+def invalidate_all_pages(sender, **kwargs):
+    bump(GLOBAL_TAG)
+
+
+@receiver((post_save, post_delete), sender=Category)
+def invalidate_category_registry(sender, **kwargs):
+    categories.invalidate()
+
+
+@receiver((post_save, post_delete), sender=Location)
+def invalidate_location_registry(sender, **kwargs):
+    locations.invalidate()
@@ -0,0 +1,126 @@
+from concurrent.futures import Future, as_completed
+from datetime import timedelta
+
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core.constants import IMAGE_TASK_MAX_ATTEMPTS, IMAGE_TASK_TIMEOUT
+
+from .images import make_renditions, release_image
+from .models import ImageTask, Post
+
+
+def image_storage():
+    return Post._meta.get_field('image').storage
+
+
+def enqueue_renditions(post):
+    return ImageTask.objects.create(post=post, image=post.image.name)
+
+
+def enqueue_missing_renditions(posts, batch_size=1000):
+    """Ставит в очередь фото публикаций, у которых нет копий."""
+    posts = posts.exclude(image='').filter(image_processing=False).only(
+        'id', 'image', 'image_renditions'
+    )
+    batch = []
+    queued = 0
+    for post in posts.iterator(chunk_size=batch_size):
+        if post.image_renditions:
+            continue
+        batch.append(ImageTask(post=post, image=post.image.name))
+        if len(batch) == batch_size:
+            queued += _enqueue_batch(batch)
+            batch = []
+    return queued + _enqueue_batch(batch)
+
+
+def _enqueue_batch(tasks):
+    ImageTask.objects.bulk_create(tasks)
+    Post.objects.filter(
+        pk__in=[task.post_id for task in tasks]
+    ).update(image_processing=True)
+    return len(tasks)
+
+
+def claim_tasks(limit):
+    """Забирает из очереди до `limit` задач.
+
+    Задачи, которые обрабатываются дольше IMAGE_TASK_TIMEOUT, считаются
+    брошенными упавшим воркером и забираются заново.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=IMAGE_TASK_TIMEOUT)
+    candidates = ImageTask.objects.filter(
+        Q(status=ImageTask.Status.PENDING)
+        | Q(status=ImageTask.Status.PROCESSING, started_at__lt=stale)
+    ).order_by('created_at').values_list('pk', 'status', 'started_at')
+    claimed = [
+        pk for pk, status, started_at in candidates[:limit]
+        if ImageTask.objects.filter(
+            pk=pk, status=status, started_at=started_at
+        ).update(
+            status=ImageTask.Status.PROCESSING,
+            started_at=now,
+            attempts=F('attempts') + 1
+        )
+    ]
+    return list(
+        ImageTask.objects.filter(pk__in=claimed).order_by('created_at')
+    )
+
+
+def render_image(name):
+    """Выполняется в процессе пула: работает только с файлами, без БД."""
+    return make_renditions(name, image_storage())
+
+
+def complete_task(task, renditions):
+    post = Post.objects.filter(pk=task.post_id).first()
+    if post is None or post.image.name != task.image:
+        # Пост удалён или фото успели заменить.
+        release_image(task.image, renditions, image_storage())
+    else:
+        post.image_renditions = renditions
+        post.image_processing = False
+        post.save(update_fields=('image_renditions', 'image_processing'))
+    task.status = ImageTask.Status.DONE
+    task.error = ''
+    task.save(update_fields=('status', 'error'))
+
+
+def fail_task(task, error):
+    task.error = repr(error)
+    if task.attempts < IMAGE_TASK_MAX_ATTEMPTS:
+        task.status = ImageTask.Status.PENDING
+    else:
+        task.status = ImageTask.Status.FAILED
+        post = Post.objects.filter(pk=task.post_id, image=task.image).first()
+        if post is not None:
+            # Показываем оригинал вместо заглушки.
+            post.image_processing = False
+            post.save(update_fields=('image_processing',))
+    task.save(update_fields=('status', 'error'))
+
+
+def run_tasks(tasks, executor=None):
+    """Обрабатывает задачи в пуле процессов или, без пула, на месте."""
+    futures = {}
+    for task in tasks:
+        if executor is not None:
+            future = executor.submit(render_image, task.image)
+        else:
+            future = Future()
+            try:
+                future.set_result(render_image(task.image))
+            except Exception as error:
+                future.set_exception(error)
+        futures[future] = task
+    for future in as_completed(futures):
+        task = futures[future]
+        try:
+            renditions = future.result()
+        except Exception as error:
+            fail_task(task, error)
+        else:
+            complete_task(task, renditions)
@@ -0,0 +1,33 @@
+from django import template
+
+from blog.cache import GLOBAL_TAG, get_versions
+
+
+register = template.Library()
+
+
+@register.filter
+def cache_version(obj):
+    """Версия объекта для ключей кэша фрагментов шаблона.
+
+    Включает глобальный тег: в карточке выводятся категория и место.
+    """
+    global_version, = get_versions((GLOBAL_TAG,))
+    return f'{global_version}-{obj.cache_version}'
+
+
+@register.filter
+def image_src(post):
+    """Самая крупная уменьшенная копия фото или сам оригинал."""
+    if post.image_renditions:
+        return post.image.storage.url(post.image_renditions[-1][1])
+    return post.image.url
+
+
+@register.filter
+def image_srcset(post):
+    """Значение атрибута srcset из уменьшенных копий фото."""
+    return ', '.join(
+        f'{post.image.storage.url(name)} {width}w'
+        for width, name in post.image_renditions
+    )
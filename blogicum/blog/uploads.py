@@ -0,0 +1,91 @@
+from django.core.files.uploadhandler import (
+    FileUploadHandler,
+    SkipFile,
+    StopUpload
+)
+from PIL import Image, ImageFile
+
+from core.constants import (
+    IMAGE_HEADER_LIMIT,
+    IMAGE_UPLOAD_FORMATS,
+    MAX_IMAGE_PIXELS,
+    MAX_IMAGE_SIDE,
+    MAX_IMAGE_UPLOAD_SIZE
+)
+
+
+class ImageUploadHandler(FileUploadHandler):
+    """Проверяет фото по мере получения, не дожидаясь конца загрузки.
+
+    Стоит первым в цепочке обработчиков: сам ничего не хранит, а только
+    разбирает заголовок изображения и считает байты, передавая данные
+    дальше. Текст ошибки остаётся в `error` для формы.
+    """
+
+    def __init__(self, request=None, field_name='image'):
+        super().__init__(request)
+        self.image_field = field_name
+        self.error = None
+        self._parser = None
+
+    def new_file(self, field_name, *args, **kwargs):
+        super().new_file(field_name, *args, **kwargs)
+        self._parser = None
+        if field_name != self.image_field:
+            return
+        if (
+            self.content_length is not None
+            and self.content_length > MAX_IMAGE_UPLOAD_SIZE
+        ):
+            self.reject_size()
+        self._parser = ImageFile.Parser()
+
+    def receive_data_chunk(self, raw_data, start):
+        if self._parser is None:
+            return raw_data
+        received = start + len(raw_data)
+        if received > MAX_IMAGE_UPLOAD_SIZE:
+            self.reject_size()
+        if self._parser.image is None:
+            try:
+                self._parser.feed(raw_data)
+            except (OSError, SyntaxError, ValueError,
+                    Image.DecompressionBombError):
+                self.reject_format()
+            if self._parser.image is not None:
+                self.check_image(self._parser.image)
+            elif received > IMAGE_HEADER_LIMIT:
+                self.reject_format()
+        return raw_data
+
+    def file_complete(self, file_size):
+        # Короткие файлы без распознанного заголовка отсеет ImageField.
+        self._parser = None
+
+    def check_image(self, image):
+        if image.format not in IMAGE_UPLOAD_FORMATS:
+            self.reject_format()
+        width, height = image.size
+        if max(width, height) > MAX_IMAGE_SIDE or (
+            width * height > MAX_IMAGE_PIXELS
+        ):
+            self.error = (
+                f'Изображение должно быть не больше {MAX_IMAGE_SIDE} точек '
+                f'по стороне и {MAX_IMAGE_PIXELS // 1_000_000} Мп.'
+            )
+            raise SkipFile
+
+    def reject_format(self):
+        self.error = (
+            'Загрузите изображение в формате '
+            f'{", ".join(IMAGE_UPLOAD_FORMATS)}.'
+        )
+        self._parser = None
+        raise SkipFile
+
+    def reject_size(self):
+        # Остаток запроса не читается: клиент не передаёт лишнего.
+        self.error = (
+            f'Файл больше {MAX_IMAGE_UPLOAD_SIZE // (1024 * 1024)} МБ.'
+        )
+        raise StopUpload(connection_reset=True)
@@ -1,12 +1,14 @@
 from django.urls import path
 
-from . import views
+from . import feeds, views
 
 
 app_name = 'blog'
 
 urlpatterns = [
     path('', views.Index.as_view(), name='index'),
+    path('feed/rss/', feeds.PostFeed(), name='feed_rss'),
+    path('feed/atom/', feeds.PostAtomFeed(), name='feed_atom'),
     path('posts/create/', views.PostCreate.as_view(), name='create_post'),
     path(
         'posts/<int:post_id>/edit/',
@@ -23,6 +25,11 @@ urlpatterns = [
         views.PostDelete.as_view(),
         name='delete_post'
     ),
+    path(
+        'posts/<int:post_id>/comments/',
+        views.CommentList.as_view(),
+        name='comments'
+    ),
     path(
         'posts/<int:post_id>/comment/',
         views.CommentCreate.as_view(),
@@ -43,11 +50,32 @@ urlpatterns = [
         views.CategoryPosts.as_view(),
         name='category_posts'
     ),
+    path(
+        'category/<slug:category_slug>/feed/rss/',
+        feeds.CategoryFeed(),
+        name='category_feed_rss'
+    ),
+    path(
+        'category/<slug:category_slug>/feed/atom/',
+        feeds.CategoryAtomFeed(),
+        name='category_feed_atom'
+    ),
     path(
         'profile/<slug:username>/',
         views.UserProfile.as_view(),
         name='profile'
     ),
+    path(
+        'profile/<slug:username>/feed/rss/',
+        feeds.AuthorFeed(),
+        name='author_feed_rss'
+    ),
+    path(
+        'profile/<slug:username>/feed/atom/',
+        feeds.AuthorAtomFeed(),
+        name='author_feed_atom'
+    ),
+    path('search/', views.Search.as_view(), name='search'),
     path(
         'edit/profile/',
         views.UserProfileUpdate.as_view(),
@@ -1,9 +1,47 @@
-from django.db.models import Count
+from django.db.models import Count, Exists, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
-from .models import Post
+from .models import Category, Comment, Post
 
 
-def public_posts_with_comment_count():
-    return Post.public_posts.annotate(
-        comment_count=Count('comments')
-    ).order_by('-pub_date')
+def public_feed_posts():
+    """Лента опубликованных постов без JOIN категорий и местоположений.
+
+    Текст постов не загружается: в ленте выводится сохранённый анонс.
+
+    Категории и местоположения подставляются из памяти процесса
+    через `attach_categories_and_locations`. Публикация категории
+    проверяется через EXISTS, а не `category_id IN (...)`: со списком
+    SQLite выбирает индекс по категории и сортирует всю выборку.
+    """
+    return Post.objects.filter(
+        Exists(Category.objects.filter(
+            pk=OuterRef('category_id'), is_published=True
+        )),
+        pub_date__lte=timezone.now(),
+        is_published=True
+    ).select_related('author').defer('text').order_by('-pub_date')
+
+
+def fill_excerpts(posts, batch_size=1000):
+    """Заново рассчитывает сохранённые анонсы публикаций."""
+    batch = []
+    updated = 0
+    for post in posts.only('id', 'text').iterator(chunk_size=batch_size):
+        post.excerpt = Post.make_excerpt(post.text)
+        batch.append(post)
+        if len(batch) == batch_size:
+            Post.objects.bulk_update(batch, ('excerpt',))
+            updated += len(batch)
+            batch.clear()
+    Post.objects.bulk_update(batch, ('excerpt',))
+    return updated + len(batch)
+
+
+def recount_comments(posts):
+    """Пересчитывает сохранённое количество комментариев у публикаций."""
+    counts = Comment.objects.filter(
+        post=OuterRef('pk')
+    ).order_by().values('post').annotate(total=Count('pk')).values('total')
+    return posts.update(comment_count=Coalesce(Subquery(counts), 0))
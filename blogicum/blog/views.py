@@ -1,6 +1,9 @@
+from urllib.parse import urlencode
+
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count
+from django.http import Http404
 from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
 from django.views.generic import (
     CreateView,
     DeleteView,
@@ -9,94 +12,206 @@ from django.views.generic import (
     UpdateView,
 )
 
-from core.constants import POSTS_PER_PAGE, USER
+from core.constants import COMMENTS_PER_PAGE, POSTS_PER_PAGE, USER
 
+from .cache import INDEX_TAG, category_tag, post_tag, profile_tag
 from .forms import CommentForm, CustomUserChangeForm, PostForm
 from .mixins import (
+    AnonymousPageCacheMixin,
+    CachedCountMixin,
     CommentUpdateDeleteMixin,
+    ConditionalGetMixin,
+    ImageUploadMixin,
+    KeysetPaginationMixin,
     PostUpdateDeleteMixin,
+    RelatedFromRegistryMixin,
     ReverseToPostPageMixin,
     ReverseToProfilePageMixin
 )
 from .models import Category, Comment, Post
-from .utils import public_posts_with_comment_count
-
-
-class Index(ListView):
+from .paginators import KeysetPaginator
+from .registry import categories
+from .search import search_posts
+from .utils import public_feed_posts
+
+
+class Index(ConditionalGetMixin,
+            AnonymousPageCacheMixin,
+            CachedCountMixin,
+            RelatedFromRegistryMixin,
+            KeysetPaginationMixin,
+            ListView):
     model = Post
     paginate_by = POSTS_PER_PAGE
     template_name = 'blog/index.html'
-    queryset = public_posts_with_comment_count()
+    keyset_links = True
 
+    def get_cache_tags(self):
+        return (INDEX_TAG,)
 
-class PostDetail(DetailView):
+    def get_queryset(self):
+        return public_feed_posts()
+
+
+class PostDetail(ConditionalGetMixin, AnonymousPageCacheMixin, DetailView):
     model = Post
     pk_url_kwarg = 'post_id'
     template_name = 'blog/detail.html'
 
-    def get_object(self):
-        obj = get_object_or_404(self.model.objects, pk=self.kwargs['post_id'])
-        if obj.author == self.request.user:
-            return obj
-        return get_object_or_404(
-            self.model.public_posts, pk=self.kwargs['post_id']
+    def get_cache_tags(self):
+        return (post_tag(self.kwargs['post_id']),)
+
+    def get_queryset(self):
+        return self.model.objects.select_related(
+            'author', 'location', 'category'
         )
 
+    def get_object(self, queryset=None):
+        post = super().get_object(queryset)
+        if not post.is_visible_to(self.request.user):
+            raise Http404('Публикация не найдена.')
+        return post
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['post'] = self.get_object()
         context['form'] = CommentForm()
-        context['comments'] = Post.objects.get(
-            id=self.kwargs['post_id']
-        ).comments.select_related('author')
+        context['comments'] = KeysetPaginator(
+            self.object.comments.select_related('author'),
+            COMMENTS_PER_PAGE,
+            ordering=CommentList.keyset_ordering
+        ).page()
         return context
 
 
-class CategoryPosts(ListView):
+class CommentList(AnonymousPageCacheMixin, KeysetPaginationMixin, ListView):
+    paginate_by = COMMENTS_PER_PAGE
+    template_name = 'includes/comment_list.html'
+    keyset_ordering = ('created_at', 'id')
+    keyset_only = True
+
+    def get_cache_tags(self):
+        return (post_tag(self.kwargs['post_id']),)
+
+    def get_queryset(self):
+        self.post = get_object_or_404(
+            Post.objects.select_related('category'),
+            pk=self.kwargs['post_id']
+        )
+        if not self.post.is_visible_to(self.request.user):
+            raise Http404('Публикация не найдена.')
+        return self.post.comments.select_related('author')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['post'] = self.post
+        context['comments'] = context['page_obj']
+        return context
+
+
+class CategoryPosts(ConditionalGetMixin,
+                    AnonymousPageCacheMixin,
+                    CachedCountMixin,
+                    RelatedFromRegistryMixin,
+                    KeysetPaginationMixin,
+                    ListView):
     model = Category
     paginate_by = POSTS_PER_PAGE
     template_name = 'blog/category.html'
+    keyset_links = True
+
+    def get_cache_tags(self):
+        return (category_tag(self.kwargs['category_slug']),)
+
+    @cached_property
+    def category(self):
+        category = categories.lookup('slug', self.kwargs['category_slug'])
+        if category is None or not category.is_published:
+            raise Http404('Категория не найдена.')
+        return category
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['category'] = Category.objects.get(
-            slug=self.kwargs['category_slug']
-        )
+        context['category'] = self.category
         return context
 
     def get_queryset(self):
-        if get_object_or_404(
-            Category,
-            slug=self.kwargs['category_slug'],
-            is_published=True
-        ):
-            return public_posts_with_comment_count().filter(
-                category__slug=self.kwargs['category_slug'],
-                category__is_published=True
-            )
-
-
-class UserProfile(ListView):
+        return public_feed_posts().filter(
+            category_id=self.category.pk
+        )
+
+
+class UserProfile(AnonymousPageCacheMixin,
+                  CachedCountMixin,
+                  RelatedFromRegistryMixin,
+                  KeysetPaginationMixin,
+                  ListView):
     model = USER
     paginate_by = POSTS_PER_PAGE
     template_name = 'blog/profile.html'
+    keyset_links = True
 
-    def get_object(self):
+    def get_cache_tags(self):
+        return (profile_tag(self.kwargs['username']),)
+
+    def get_count_cache_parts(self):
+        return (*super().get_count_cache_parts(), self.is_owner)
+
+    @cached_property
+    def is_owner(self):
+        return self.request.user.username == self.kwargs['username']
+
+    @cached_property
+    def profile(self):
+        if self.is_owner:
+            return self.request.user
         return get_object_or_404(self.model, username=self.kwargs['username'])
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['profile'] = self.get_object()
+        context['profile'] = self.profile
         return context
 
     def get_queryset(self):
-        if self.request.user.username == self.kwargs['username']:
-            return self.get_object().posts.annotate(
-                comment_count=Count('comments')
-            ).order_by('-pub_date')
-        return public_posts_with_comment_count().filter(
-            author__username=self.get_object().username
-        )
+        if self.is_owner:
+            posts = Post.objects.defer('text').order_by('-pub_date')
+        else:
+            posts = public_feed_posts().select_related(None)
+        return posts.filter(author_id=self.profile.pk)
+
+    def paginate_queryset(self, queryset, page_size):
+        paginated = super().paginate_queryset(queryset, page_size)
+        author_field = Post._meta.get_field('author')
+        for post in paginated[2]:
+            author_field.set_cached_value(post, self.profile)
+        return paginated
+
+
+class Search(AnonymousPageCacheMixin,
+             CachedCountMixin,
+             RelatedFromRegistryMixin,
+             ListView):
+    paginate_by = POSTS_PER_PAGE
+    template_name = 'blog/search.html'
+    cache_query_params = ('q', 'page')
+
+    @cached_property
+    def query(self):
+        return self.request.GET.get('q', '').strip()
+
+    def get_cache_tags(self):
+        return (INDEX_TAG,)
+
+    def get_count_cache_parts(self):
+        return (*super().get_count_cache_parts(), self.query)
+
+    def get_queryset(self):
+        return search_posts(self.query)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.query
+        context['extra_query'] = urlencode({'q': self.query}) + '&'
+        return context
 
 
 class UserProfileUpdate(LoginRequiredMixin,
@@ -110,7 +225,8 @@ class UserProfileUpdate(LoginRequiredMixin,
         return self.request.user
 
 
-class PostCreate(LoginRequiredMixin,
+class PostCreate(ImageUploadMixin,
+                 LoginRequiredMixin,
                  ReverseToProfilePageMixin,
                  CreateView):
     model = Post
@@ -122,7 +238,8 @@ class PostCreate(LoginRequiredMixin,
         return super().form_valid(form)
 
 
-class PostUpdate(PostUpdateDeleteMixin,
+class PostUpdate(ImageUploadMixin,
+                 PostUpdateDeleteMixin,
                  ReverseToPostPageMixin,
                  ReverseToProfilePageMixin,
                  UpdateView):
@@ -131,12 +248,9 @@ class PostUpdate(PostUpdateDeleteMixin,
 
 class PostDelete(PostUpdateDeleteMixin, DeleteView):
 
-    def get_object(self):
-        return get_object_or_404(self.model, pk=self.kwargs['post_id'])
-
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['form'] = PostForm(instance=self.get_object())
+        context['form'] = PostForm(instance=self.object)
         return context
 
 
@@ -167,11 +281,4 @@ class CommentDelete(CommentUpdateDeleteMixin,
                     ReverseToPostPageMixin,
                     LoginRequiredMixin,
                     DeleteView):
-
-    def get_object(self):
-        return get_object_or_404(self.model, pk=self.kwargs['comment_id'])
-
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context['comment'] = self.get_object()
-        return context
+    pass
@@ -26,12 +26,54 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static_dev',
 ]
 
+MEDIA_URL = '/media/'
+
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Отдача медиа веб-сервером: None — силами Django, 'x-sendfile' (Apache,
+# lighttpd) или 'x-accel-redirect' (nginx, internal-локация
+# MEDIA_ACCEL_REDIRECT_URL, указывающая на MEDIA_ROOT).
+MEDIA_SENDFILE = None
+
+MEDIA_ACCEL_REDIRECT_URL = '/protected-media/'
+
+DEFAULT_FILE_STORAGE = 'core.storage.ContentAddressedStorage'
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
+# В кэше лежат страницы, карточки постов, счётчики и версии тегов
+# каждого поста, категории и профиля: 300 записей по умолчанию хватает
+# на несколько страниц, после чего кэш постоянно вычищается.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 50_000,
+        },
+    },
+    'filesystem': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 100_000,
+        },
+    },
+}
+
+# Локальная память не разделяется между процессами: при нескольких
+# воркерах переключите кэш страниц на 'filesystem'. Иначе справочники
+# категорий и мест в других воркерах обновятся только через
+# REGISTRY_TIMEOUT.
+PAGE_CACHE_ALIAS = 'default'
+
+# Движок поиска: 'fts5', 'inverted' или 'auto' — FTS5, если SQLite
+# собран с ним, иначе встроенный инвертированный индекс.
+SEARCH_BACKEND = 'auto'
+
+SEARCH_INDEX_DIR = BASE_DIR / 'search_index'
+
 INSTALLED_APPS = [
     'blog.apps.BlogConfig',
     'core.apps.CoreConfig',
@@ -113,4 +155,10 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 
+STATIC_ROOT = BASE_DIR / 'static'
+
+if not DEBUG:
+    # Имена с хешем и сжатые копии; нужен collectstatic.
+    STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
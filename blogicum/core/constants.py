@@ -7,6 +7,50 @@ MAX_CAT_TITLE_LENGTH = 30
 
 MAX_COMMENT_LENGTH = 50
 
+EXCERPT_WORDS = 10
+
 POSTS_PER_PAGE = 10
 
+COMMENTS_PER_PAGE = 20
+
+FEED_ITEMS = 20
+
+PAGE_CACHE_TIMEOUT = 60 * 5
+
+COUNT_CACHE_TIMEOUT = 60
+
+REGISTRY_TIMEOUT = 60
+
+MAX_COUNTED_POSTS = 10_000
+
+MAX_OFFSET_PAGES = 10
+
+MAX_SEARCH_RESULTS = 1000
+
+IMAGE_RENDITION_WIDTHS = (320, 640, 1280)
+
+IMAGE_RENDITION_QUALITY = 80
+
+IMAGE_TASK_MAX_ATTEMPTS = 3
+
+IMAGE_TASK_TIMEOUT = 60 * 10
+
+MAX_IMAGE_UPLOAD_SIZE = 10 * 1024 * 1024
+
+MAX_IMAGE_SIDE = 10_000
+
+MAX_IMAGE_PIXELS = 40_000_000
+
+IMAGE_HEADER_LIMIT = 512 * 1024
+
+FILE_LEASE_TIMEOUT = 60 * 10
+
+IMAGE_UPLOAD_FORMATS = ('JPEG', 'PNG', 'GIF', 'WEBP')
+
+MEDIA_CACHE_TIMEOUT = 60 * 60
+
+IMMUTABLE_CACHE_TIMEOUT = 60 * 60 * 24 * 365
+
+FILE_CHUNK_SIZE = 64 * 1024
+
 USER = get_user_model()
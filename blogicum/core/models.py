@@ -27,3 +27,39 @@ class CreatedAtModel(models.Model):
     class Meta:
         abstract = True
         ordering = ('created_at',)
+
+
+class UpdatedAtModel(models.Model):
+    """Абстрактная модель. Добавляет время и номер последнего изменения.
+
+    Оба поля меняются при каждом save(), в том числе с update_fields,
+    но не при QuerySet.update().
+    """
+
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        verbose_name='Изменено'
+    )
+    version = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Версия'
+    )
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        self.version += 1
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {
+                *update_fields, 'updated_at', 'version'
+            }
+        super().save(*args, **kwargs)
+
+    @property
+    def cache_version(self):
+        """Строка для ключей кэша, меняется при каждом сохранении."""
+        return f'{self.version}.{self.updated_at.timestamp():.6f}'
@@ -0,0 +1,194 @@
+import gzip
+import hashlib
+import os
+import posixpath
+import re
+import secrets
+import time
+from contextlib import contextmanager
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.utils.functional import cached_property
+
+from .constants import FILE_LEASE_TIMEOUT
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.map', '.svg', '.ico', '.txt', '.html', '.json', '.xml'
+)
+
+# Сжатая копия, выигрывающая меньше 5%, не сохраняется.
+MIN_COMPRESSION_RATIO = 0.95
+
+HASHED_NAME_RE = re.compile(
+    r'(?:^|/)([0-9a-f]{2})/([0-9a-f]{62})(-\d+)?(?:\.\w+)?$'
+)
+
+LOCK_NAME = '.lock'
+LEASES_DIR = '.leases'
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """Хранилище, где имя файла — SHA-256 его содержимого.
+
+    Файл `post_images/photo.JPG` сохраняется как
+    `post_images/ab/cdef….jpg`: одинаковые загрузки занимают место на
+    диске один раз, а содержимое по имени никогда не меняется.
+    """
+
+    @staticmethod
+    def name_digest(name):
+        """SHA-256 из имени файла или None, если имя не такое.
+
+        Для копий, сохранённых через save_derived(), к хешу оригинала
+        добавляется суффикс копии.
+        """
+        match = HASHED_NAME_RE.search(name)
+        return match and ''.join(filter(None, match.groups()))
+
+    def get_available_name(self, name, max_length=None):
+        # Имя определяется содержимым уже в _save().
+        return name
+
+    @contextmanager
+    def lock(self):
+        """Блокирует создание и удаление файлов между процессами."""
+        os.makedirs(self.location, exist_ok=True)
+        with open(self.path(LOCK_NAME), 'a') as file:
+            if fcntl is not None:
+                fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+            yield
+
+    def is_leased(self, name):
+        """Файл только что загружен повторно и ссылка на него ещё не в базе."""
+        try:
+            leased_at = os.path.getmtime(self._lease_path(name))
+        except FileNotFoundError:
+            return False
+        return time.time() - leased_at < FILE_LEASE_TIMEOUT
+
+    def settle(self, name):
+        """Снимает отметку is_leased(), когда ссылка на файл сохранена."""
+        try:
+            os.remove(self._lease_path(name))
+        except FileNotFoundError:
+            pass
+
+    def save_derived(self, name, content):
+        """Сохраняет файл под именем `name` без хеширования содержимого.
+
+        Для копий файла, чьё имя уже построено из хеша оригинала:
+        существующая копия не перезаписывается.
+        """
+        temporary, _ = self._write_temporary(posixpath.dirname(name), content)
+        try:
+            self._link(temporary, name, lease=False)
+        finally:
+            os.remove(temporary)
+        return name
+
+    def _save(self, name, content):
+        directory = posixpath.dirname(name)
+        extension = posixpath.splitext(name)[1].lower()
+        temporary, hexdigest = self._write_temporary(directory, content)
+        try:
+            name = posixpath.join(
+                directory, hexdigest[:2], hexdigest[2:] + extension
+            )
+            self._link(temporary, name, lease=True)
+        finally:
+            os.remove(temporary)
+        return name
+
+    def _write_temporary(self, directory, content):
+        os.makedirs(self.path(directory), exist_ok=True)
+        digest = hashlib.sha256()
+        temporary = self.path(
+            posixpath.join(directory, f'.upload-{secrets.token_hex(8)}')
+        )
+        descriptor = os.open(
+            temporary,
+            os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0),
+            0o666
+        )
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    file.write(chunk)
+        except BaseException:
+            os.remove(temporary)
+            raise
+        return temporary, digest.hexdigest()
+
+    def _link(self, temporary, name, lease):
+        path = self.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self.lock():
+            try:
+                # Ссылка создаётся атомарно и только если файла ещё нет.
+                os.link(temporary, path)
+            except FileExistsError:
+                # Файл мог как раз освобождаться: отметка не даёт
+                # удалить его, пока новая ссылка не записана в базу.
+                if lease:
+                    self._lease(name)
+                return
+        if self.file_permissions_mode is not None:
+            os.chmod(path, self.file_permissions_mode)
+
+    def _lease_path(self, name):
+        return self.path(posixpath.join(LEASES_DIR, name))
+
+    def _lease(self, name):
+        path = self._lease_path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'a'):
+            pass
+        os.utime(path)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Статика с хешем в имени и заранее сжатыми копиями.
+
+    После collectstatic рядом с текстовыми файлами лежат `.gz` и, если
+    установлен пакет brotli, `.br`. core.views.serve_static выбирает
+    копию по Accept-Encoding.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in (*paths, *self.hashed_files.values()):
+            if name.lower().endswith(COMPRESSIBLE_EXTENSIONS):
+                self.compress(name)
+
+    def compress(self, name):
+        with self.open(name) as file:
+            content = file.read()
+        variants = [('.gz', gzip.compress(content, 9, mtime=0))]
+        if brotli is not None:
+            variants.append(('.br', brotli.compress(content, quality=11)))
+        for suffix, compressed in variants:
+            if len(compressed) > len(content) * MIN_COMPRESSION_RATIO:
+                continue
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            self._save(name + suffix, ContentFile(compressed))
+
+    @cached_property
+    def immutable_names(self):
+        """Имена с хешем: их содержимое не меняется."""
+        return frozenset(self.hashed_files.values())
@@ -0,0 +1,230 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import (
+    ImproperlyConfigured,
+    SuspiciousFileOperation
+)
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    StreamingHttpResponse
+)
+from django.utils._os import safe_join
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers
+)
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+from .constants import (
+    FILE_CHUNK_SIZE,
+    IMMUTABLE_CACHE_TIMEOUT,
+    MEDIA_CACHE_TIMEOUT
+)
+from .storage import ContentAddressedStorage
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+SENDFILE_MODES = (None, 'x-sendfile', 'x-accel-redirect')
+
+# Предпочтительные первыми.
+STATIC_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def resolve_file(root, path):
+    """Путь к файлу внутри `root` или 404.
+
+    Скрытые файлы, например незавершённые загрузки, не отдаются.
+    """
+    if any(part.startswith('.') for part in path.split('/')):
+        raise Http404
+    try:
+        file_path = safe_join(root, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    try:
+        stat = os.stat(file_path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404
+    if not os.path.isfile(file_path):
+        raise Http404
+    return file_path, stat
+
+
+def accepted_encodings(header):
+    """Кодировки из Accept-Encoding, кроме запрещённых через q=0."""
+    encodings = set()
+    for item in header.split(','):
+        coding, _, params = item.partition(';')
+        quality = params.strip()
+        if quality.startswith('q='):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        encodings.add(coding.strip().lower())
+    return encodings
+
+
+def file_etag(stat):
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def set_file_headers(response, etag, last_modified, max_age, immutable):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Accept-Ranges'] = 'bytes'
+    response['X-Content-Type-Options'] = 'nosniff'
+    patch_cache_control(response, public=True, max_age=max_age)
+    if immutable:
+        patch_cache_control(response, immutable=True)
+    return response
+
+
+def requested_range(request, size, etag, last_modified):
+    """Диапазон (start, end) из заголовка Range или None.
+
+    Несколько диапазонов, устаревший If-Range и некорректный диапазон
+    с концом раньше начала дают целый файл. Возвращает False, если
+    диапазон не пересекается с файлом.
+    """
+    match = RANGE_RE.match(request.META.get('HTTP_RANGE', '').strip())
+    if not match or not any(match.groups()):
+        return None
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if if_range and if_range != etag and (
+        parse_http_date_safe(if_range) != last_modified
+    ):
+        return None
+    first, last = match.groups()
+    if not first:
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        end = min(int(last), size - 1) if last else size - 1
+    if start > end or start >= size:
+        return False
+    return start, end
+
+
+def read_range(file, start, length):
+    with file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(FILE_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def serve_file(request, file_path, stat, *, name, etag=None,
+               max_age=MEDIA_CACHE_TIMEOUT, immutable=False,
+               content_type=None, accel_path=None):
+    """Отдаёт файл с поддержкой условных запросов и Range.
+
+    В режиме MEDIA_SENDFILE тело отдаёт веб-сервер: ответ содержит только
+    заголовок X-Sendfile или X-Accel-Redirect с путём `accel_path`.
+    """
+    etag = etag or file_etag(stat)
+    last_modified = int(stat.st_mtime)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified,
+        response=set_file_headers(
+            HttpResponse(), etag, last_modified, max_age, immutable
+        )
+    )
+    if response.status_code != 200:
+        return response
+    content_type = content_type or (
+        mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    )
+    mode = settings.MEDIA_SENDFILE
+    if mode not in SENDFILE_MODES:
+        raise ImproperlyConfigured(
+            f'Неизвестный режим отдачи MEDIA_SENDFILE={mode!r}.'
+        )
+    if mode == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = file_path
+    elif mode == 'x-accel-redirect' and accel_path:
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = quote(accel_path)
+    else:
+        byte_range = requested_range(
+            request, stat.st_size, etag, last_modified
+        )
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+            return response
+        file = open(file_path, 'rb')
+        if byte_range is None:
+            response = FileResponse(file, content_type=content_type)
+            response.block_size = FILE_CHUNK_SIZE
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                read_range(file, start, end - start + 1),
+                status=206, content_type=content_type
+            )
+            response['Content-Length'] = end - start + 1
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+    return set_file_headers(
+        response, etag, last_modified, max_age, immutable
+    )
+
+
+@require_safe
+def serve_media(request, path):
+    """Загруженные файлы.
+
+    Имена из ContentAddressedStorage не меняют содержимого, поэтому
+    кэшируются браузером навсегда, а ETag — это хеш из имени.
+    """
+    file_path, stat = resolve_file(settings.MEDIA_ROOT, path)
+    digest = ContentAddressedStorage.name_digest(path)
+    return serve_file(
+        request, file_path, stat, name=path,
+        etag=digest and f'"{digest}"',
+        max_age=IMMUTABLE_CACHE_TIMEOUT if digest else MEDIA_CACHE_TIMEOUT,
+        immutable=bool(digest),
+        accel_path=settings.MEDIA_ACCEL_REDIRECT_URL + path
+    )
+
+
+@require_safe
+def serve_static(request, path):
+    """Статика из STATIC_ROOT, при возможности — заранее сжатая копия."""
+    file_path, stat = resolve_file(settings.STATIC_ROOT, path)
+    encodings = accepted_encodings(
+        request.META.get('HTTP_ACCEPT_ENCODING', '')
+    )
+    encoding = None
+    for coding, suffix in STATIC_ENCODINGS:
+        if coding in encodings and os.path.isfile(file_path + suffix):
+            file_path += suffix
+            stat = os.stat(file_path)
+            encoding = coding
+            break
+    immutable = path in getattr(staticfiles_storage, 'immutable_names', ())
+    response = serve_file(
+        request, file_path, stat, name=path,
+        max_age=IMMUTABLE_CACHE_TIMEOUT if immutable else MEDIA_CACHE_TIMEOUT,
+        immutable=immutable
+    )
+    if encoding and response.status_code in (200, 206):
+        response['Content-Encoding'] = encoding
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
@@ -33,6 +33,8 @@ class PostModelAdapter(StudentModelAdapter):
             "author",
             "category",
             "location",
+            "updated_at",
+            "version",
             "refresh_from_db",
         ]
 
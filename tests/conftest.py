@@ -1,8 +1,10 @@
 import os
 import re
 import time
+from datetime import timedelta
 from http import HTTPStatus
 from inspect import getsource
+from io import BytesIO
 from pathlib import Path
 from typing import (
     Iterable,
@@ -18,13 +20,18 @@ from typing import (
 
 import pytest
 from django.apps import apps
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
 from django.test import override_settings
 from django.test.client import Client
+from django.utils import timezone
 from mixer.backend.django import mixer as _mixer
+from PIL import Image
 
 N_PER_FIXTURE = 3
 N_PER_PAGE = 10
@@ -41,6 +48,13 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    for alias in settings.CACHES:
+        caches[alias].clear()
+    yield
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -96,6 +110,82 @@ pytest_plugins = [
 ]
 
 
+@pytest.fixture
+def frozen_now(monkeypatch):
+    current = {"now": timezone.now()}
+    monkeypatch.setattr(timezone, "now", lambda: current["now"])
+    return current
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def image_upload(size=(800, 600), image_format="PNG", mode="RGB", name=None,
+                 **save_options):
+    buffer = BytesIO()
+    Image.new(mode, size, color=(10, 20, 30, 255)[:len(mode)]).save(
+        buffer, image_format, **save_options
+    )
+    return SimpleUploadedFile(
+        name or f"photo.{image_format.lower()}",
+        buffer.getvalue(),
+        Image.MIME[image_format],
+    )
+
+
+def image_post_data(category, image):
+    return {
+        "title": "Фото",
+        "text": "Текст",
+        "pub_date": timezone.localtime().strftime("%Y-%m-%d %H:%M"),
+        "category": category.id,
+        "is_published": True,
+        "image": image,
+    }
+
+
+def create_image_post(client, category, image=None):
+    response = client.post(
+        "/posts/create/", image_post_data(category, image or image_upload())
+    )
+    assert response.status_code == HTTPStatus.FOUND
+    return apps.get_model("blog", "Post").objects.latest("pk")
+
+
+@pytest.fixture
+def searchable_posts(mixer, user, published_category,
+                     django_capture_on_commit_callbacks):
+    past = timezone.now() - timedelta(days=1)
+    with django_capture_on_commit_callbacks(execute=True):
+        posts = {
+            name: mixer.blend(
+                "blog.Post",
+                author=user,
+                category=published_category,
+                is_published=is_published,
+                pub_date=past,
+                title=title,
+                text=text,
+            )
+            for name, title, text, is_published in (
+                ("title", "Прогулка по горам", "Короткий рассказ.", True),
+                ("text", "Выходные", "Долгая прогулка вдоль реки.", True),
+                ("hidden", "Прогулка тайком", "Черновик.", False),
+                ("other", "Рецепт пирога", "Мука и яблоки.", True),
+            )
+        }
+    return posts
+
+
+def search_ids(client, query):
+    response = client.get("/search/", {"q": query})
+    assert response.status_code == HTTPStatus.OK
+    return [post.id for post in response.context["page_obj"]]
+
+
 @pytest.fixture
 def mixer():
     return _mixer
@@ -363,6 +453,7 @@ def cleanup(request):
                     filename.endswith(".jpg")
                     or filename.endswith(".gif")
                     or filename.endswith(".png")
+                    or filename.endswith(".webp")
             ):
                 file_path = os.path.join(root, filename)
                 if os.path.getmtime(file_path) >= start_time:
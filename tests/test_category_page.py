@@ -0,0 +1,84 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Category
+
+
+def _category_table_queries(queries):
+    return [
+        query["sql"] for query in queries
+        if query["sql"].startswith('SELECT "blog_category"')
+    ]
+
+
+@pytest.mark.django_db
+def test_category_is_resolved_from_registry(
+        user_client, post_with_published_location):
+    url = f"/category/{post_with_published_location.category.slug}/"
+    user_client.get(url)
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    assert response.context["category"] == (
+        post_with_published_location.category
+    )
+    assert not _category_table_queries(queries)
+
+
+@pytest.mark.django_db
+def test_category_changes_reach_the_registry(
+        user_client, post_with_published_location):
+    category = post_with_published_location.category
+    url = f"/category/{category.slug}/"
+    user_client.get(url)
+
+    category.title = "Переименованная категория"
+    category.save()
+    assert category.title in user_client.get(url).content.decode()
+
+    category.is_published = False
+    category.save()
+    assert user_client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_registry_expires_without_shared_version(
+        user_client, post_with_published_location, monkeypatch):
+    category = post_with_published_location.category
+    url = f"/category/{category.slug}/"
+    user_client.get(url)
+    # Так выглядит снятие с публикации в другом процессе с locmem-кэшем.
+    Category.objects.filter(pk=category.pk).update(is_published=False)
+    assert user_client.get(url).status_code == HTTPStatus.OK
+
+    monkeypatch.setattr("blog.registry.REGISTRY_TIMEOUT", 0)
+    assert user_client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_feed_query_does_not_join_categories_and_locations(
+        user_client, post_with_published_location):
+    user_client.get("/")
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get("/")
+    post = response.context["page_obj"][0]
+    assert post.category == post_with_published_location.category
+    assert post.location == post_with_published_location.location
+    feed_queries = [q["sql"] for q in queries if 'FROM "blog_post"' in q["sql"]]
+    assert feed_queries
+    for sql in feed_queries:
+        assert 'JOIN "blog_category"' not in sql
+        assert 'JOIN "blog_location"' not in sql
+
+
+@pytest.mark.django_db
+def test_location_changes_reach_the_feed(
+        user_client, post_with_published_location):
+    location = post_with_published_location.location
+    user_client.get("/")
+    location.name = "Новое место"
+    location.save()
+    assert location.name in user_client.get("/").content.decode()
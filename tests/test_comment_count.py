@@ -0,0 +1,71 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Comment
+
+
+@pytest.mark.django_db
+def test_comment_count_follows_comments(
+        mixer, user_client, user, post_with_published_location):
+    post = post_with_published_location
+    user_client.post(f"/posts/{post.id}/comment/", data={"text": "Первый"})
+    user_client.post(f"/posts/{post.id}/comment/", data={"text": "Второй"})
+    post.refresh_from_db()
+    assert post.comment_count == 2
+
+    comment = post.comments.first()
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}/")
+    post.refresh_from_db()
+    assert post.comment_count == 1
+
+    post.comments.all().delete()
+    post.refresh_from_db()
+    assert post.comment_count == 0
+
+
+@pytest.mark.django_db
+def test_recount_comments_command(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    type(post).objects.update(comment_count=0)
+    call_command("recount_comments", stdout=None)
+    post.refresh_from_db()
+    assert post.comment_count == 3
+
+
+def _comment_count_updates(queries):
+    return [
+        query for query in queries
+        if query["sql"].startswith("UPDATE")
+        and "comment_count" in query["sql"]
+    ]
+
+
+@pytest.mark.django_db
+def test_post_delete_skips_comment_counts(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(30).blend("blog.Comment", post=post)
+    with CaptureQueriesContext(connection) as queries:
+        post.delete()
+    assert not _comment_count_updates(queries)
+    assert not Comment.objects.exists()
+
+
+@pytest.mark.django_db
+def test_bulk_comment_delete_updates_counts_per_post(
+        mixer, user, published_category):
+    posts = mixer.cycle(2).blend(
+        "blog.Post", author=user, category=published_category
+    )
+    for post in posts:
+        mixer.cycle(5).blend("blog.Comment", post=post)
+    kept = mixer.blend("blog.Comment", post=posts[1])
+
+    with CaptureQueriesContext(connection) as queries:
+        Comment.objects.filter(post__in=posts).exclude(pk=kept.pk).delete()
+    assert len(_comment_count_updates(queries)) == len(posts)
+    for post, count in zip(posts, (0, 1)):
+        post.refresh_from_db()
+        assert post.comment_count == count
@@ -0,0 +1,90 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+
+
+def _urls(post):
+    return ("/", f"/category/{post.category.slug}/", f"/posts/{post.id}/")
+
+
+@pytest.mark.django_db
+def test_unchanged_pages_are_not_modified(
+        client, post_with_published_location, django_assert_num_queries):
+    for url in _urls(post_with_published_location):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert "no-cache" in response["Cache-Control"]
+        with django_assert_num_queries(0):
+            revalidated = client.get(
+                url, HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+        assert revalidated.status_code == HTTPStatus.NOT_MODIFIED
+        revalidated = client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        assert revalidated.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_changes_update_etag(
+        mixer, client, post_with_published_location):
+    post = post_with_published_location
+    etags = {url: client.get(url)["ETag"] for url in _urls(post)}
+    post.title = "Новый заголовок"
+    post.save()
+    for url, etag in etags.items():
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response["ETag"] != etag
+
+    url = f"/posts/{post.id}/"
+    etag = client.get(url)["ETag"]
+    mixer.blend("blog.Comment", post=post)
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == (
+        HTTPStatus.OK
+    )
+
+
+@pytest.mark.django_db
+def test_scheduled_publication_updates_validators(
+        mixer, client, user, published_category, frozen_now):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=frozen_now["now"] + timedelta(hours=1),
+    )
+    response = client.get("/")
+    frozen_now["now"] += timedelta(hours=2)
+    revalidated = client.get(
+        "/",
+        HTTP_IF_NONE_MATCH=response["ETag"],
+        HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+    )
+    assert revalidated.status_code == HTTPStatus.OK
+    assert post.title in revalidated.content.decode()
+    revalidated = client.get(
+        "/", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+    )
+    assert revalidated.status_code == HTTPStatus.OK
+
+
+@pytest.mark.django_db
+def test_user_pages_are_private(
+        client, user_client, post_with_published_location):
+    url = f"/posts/{post_with_published_location.id}/"
+    anonymous = client.get(url)
+    # Первый ответ выдаёт CSRF-куку, она входит в ETag.
+    user_client.get(url)
+    response = user_client.get(url)
+    assert "private" in response["Cache-Control"]
+    assert not response.has_header("Last-Modified")
+    assert response["ETag"] != anonymous["ETag"]
+    assert user_client.get(
+        url, HTTP_IF_NONE_MATCH=response["ETag"]
+    ).status_code == HTTPStatus.NOT_MODIFIED
+    assert user_client.get(
+        url, HTTP_IF_NONE_MATCH=anonymous["ETag"]
+    ).status_code == HTTPStatus.OK
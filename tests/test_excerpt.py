@@ -0,0 +1,29 @@
+import pytest
+from django.core.management import call_command
+from django.template.defaultfilters import truncatewords
+
+
+@pytest.mark.django_db
+def test_excerpt_is_stored_on_save(post_with_published_location):
+    post = post_with_published_location
+    post.text = " ".join(f"слово{i}" for i in range(30))
+    post.save()
+    post.refresh_from_db()
+    assert post.excerpt == truncatewords(post.text, 10)
+
+
+@pytest.mark.django_db
+def test_fill_excerpts_command(post_with_published_location):
+    post = post_with_published_location
+    type(post).objects.update(excerpt="")
+    call_command("fill_excerpts", stdout=None)
+    post.refresh_from_db()
+    assert post.excerpt == truncatewords(post.text, 10)
+
+
+@pytest.mark.django_db
+def test_feed_does_not_load_post_text(client, post_with_published_location):
+    response = client.get("/")
+    post = response.context["page_obj"][0]
+    assert "text" in post.get_deferred_fields()
+    assert post.excerpt in response.content.decode()
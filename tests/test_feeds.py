@@ -0,0 +1,102 @@
+from datetime import timedelta
+from http import HTTPStatus
+from xml.etree import ElementTree
+
+import pytest
+from django.utils import timezone
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+def _titles(response):
+    root = ElementTree.fromstring(response.content)
+    if root.tag == f"{ATOM}feed":
+        return [entry.findtext(f"{ATOM}title")
+                for entry in root.iter(f"{ATOM}entry")]
+    return [item.findtext("title") for item in root.iter("item")]
+
+
+def _feed_urls(post):
+    return [
+        f"{prefix}feed/{kind}/"
+        for prefix in (
+            "/",
+            f"/category/{post.category.slug}/",
+            f"/profile/{post.author.username}/",
+        )
+        for kind in ("rss", "atom")
+    ]
+
+
+@pytest.mark.django_db
+def test_feeds_list_public_posts(
+        mixer, client, user, published_category, post_with_published_location):
+    post = post_with_published_location
+    hidden = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False
+    )
+    scheduled = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        pub_date=timezone.now() + timedelta(days=1)
+    )
+    for url in _feed_urls(post):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        titles = _titles(response)
+        assert post.title in titles
+        assert hidden.title not in titles
+        assert scheduled.title not in titles
+
+
+@pytest.mark.django_db
+def test_feed_for_hidden_category_is_not_found(
+        client, post_with_published_location):
+    category = post_with_published_location.category
+    category.is_published = False
+    category.save()
+    response = client.get(f"/category/{category.slug}/feed/rss/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert client.get("/profile/nobody/feed/rss/").status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+
+
+@pytest.mark.django_db
+def test_feeds_are_cached_and_revalidated(
+        client, post_with_published_location, django_assert_num_queries):
+    post = post_with_published_location
+    for url in _feed_urls(post):
+        response = client.get(url)
+        with django_assert_num_queries(0):
+            cached = client.get(url)
+            revalidated = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        assert cached.content == response.content
+        assert revalidated.status_code == HTTPStatus.NOT_MODIFIED
+        revalidated = client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        assert revalidated.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_publishing_invalidates_feeds(
+        mixer, client, user, post_with_published_location):
+    post = post_with_published_location
+    etags = {url: client.get(url)["ETag"] for url in _feed_urls(post)}
+    new_post = mixer.blend(
+        "blog.Post", author=user, category=post.category,
+        pub_date=timezone.now() - timedelta(minutes=1)
+    )
+    for url, etag in etags.items():
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert new_post.title in _titles(response)
+
+
+@pytest.mark.django_db
+def test_pages_link_feeds(client, post_with_published_location):
+    post = post_with_published_location
+    content = client.get(f"/category/{post.category.slug}/").content.decode()
+    assert f"/category/{post.category.slug}/feed/atom/" in content
+    assert "/feed/rss/" in client.get("/").content.decode()
@@ -0,0 +1,112 @@
+import pytest
+from bs4 import BeautifulSoup
+from django.core.management import call_command
+from django.utils import timezone
+from PIL import Image
+
+from blog.models import ImageTask
+from conftest import create_image_post, image_upload
+
+
+def _process_queue():
+    call_command("process_image_tasks", once=True, workers=0, stdout=None)
+
+
+def _feed_images(client):
+    soup = BeautifulSoup(client.get("/").content, "html.parser")
+    return soup.select("img.img-thumbnail")
+
+
+@pytest.mark.django_db
+def test_upload_creates_renditions(user_client, published_category,
+                                   media_root):
+    post = create_image_post(
+        user_client, published_category, image_upload((1600, 900), mode="RGBA")
+    )
+    assert post.image_processing and post.image_renditions == []
+    [placeholder] = _feed_images(user_client)
+    assert placeholder["src"].endswith("image_processing.svg")
+
+    _process_queue()
+    post.refresh_from_db()
+    assert not post.image_processing
+    assert ImageTask.objects.get().status == ImageTask.Status.DONE
+    assert [width for width, _ in post.image_renditions] == [320, 640, 1280]
+    for width, name in post.image_renditions:
+        with Image.open(media_root / name) as rendition:
+            assert rendition.format == "WEBP"
+            assert rendition.size == (width, round(900 * width / 1600))
+
+    images = _feed_images(user_client)
+    assert len(images) == 1
+    assert images[0]["src"].endswith(post.image_renditions[-1][1])
+    assert images[0].parent["href"] == images[0]["src"]
+    assert images[0]["srcset"].count("w,") == 2
+
+
+@pytest.mark.django_db
+def test_small_upload_is_not_upscaled(user_client, published_category,
+                                      media_root):
+    post = create_image_post(
+        user_client, published_category, image_upload((200, 100), mode="RGBA")
+    )
+    _process_queue()
+    post.refresh_from_db()
+    assert [width for width, _ in post.image_renditions] == [200]
+
+
+@pytest.mark.django_db
+def test_edit_keeps_or_replaces_renditions(user_client, published_category,
+                                           media_root):
+    post = create_image_post(
+        user_client, published_category, image_upload((800, 600), mode="RGBA")
+    )
+    _process_queue()
+    post.refresh_from_db()
+    renditions = post.image_renditions
+    data = {
+        "title": "Новое фото",
+        "text": "Текст",
+        "pub_date": timezone.localtime().strftime("%Y-%m-%d %H:%M"),
+        "category": published_category.id,
+        "is_published": True,
+    }
+    user_client.post(f"/posts/{post.id}/edit/", data)
+    post.refresh_from_db()
+    assert post.image_renditions == renditions
+    assert ImageTask.objects.count() == 1
+
+    user_client.post(f"/posts/{post.id}/edit/", {**data, "image-clear": "on"})
+    post.refresh_from_db()
+    assert not post.image and post.image_renditions == []
+
+
+@pytest.mark.django_db
+def test_replaced_image_discards_stale_renditions(
+        user_client, published_category, media_root):
+    post = create_image_post(
+        user_client, published_category, image_upload((800, 600), mode="RGBA")
+    )
+    post.image = "post_images/other.png"
+    post.save()
+    _process_queue()
+    post.refresh_from_db()
+    assert post.image_processing and post.image_renditions == []
+    assert list(media_root.rglob("*.webp")) == []
+
+
+@pytest.mark.django_db
+def test_failed_task_falls_back_to_original(
+        user_client, published_category, media_root):
+    post = create_image_post(
+        user_client, published_category, image_upload((800, 600), mode="RGBA")
+    )
+    (media_root / post.image.name).unlink()
+    _process_queue()
+    task = ImageTask.objects.get()
+    assert task.status == ImageTask.Status.FAILED
+    assert task.attempts == 3 and "FileNotFoundError" in task.error
+    post.refresh_from_db()
+    assert not post.image_processing
+    [image] = _feed_images(user_client)
+    assert image["src"].endswith(post.image.name)
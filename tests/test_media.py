@@ -0,0 +1,111 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.files.base import ContentFile
+from django.utils.http import http_date
+
+from core.storage import ContentAddressedStorage
+
+CONTENT = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def hashed_name(media_root):
+    return ContentAddressedStorage(location=media_root).save(
+        "post_images/photo.jpg", ContentFile(CONTENT)
+    )
+
+
+@pytest.fixture
+def plain_name(media_root):
+    (media_root / "plain.txt").write_bytes(CONTENT)
+    return "plain.txt"
+
+
+def _body(response):
+    return b"".join(response.streaming_content)
+
+
+def test_hashed_file_is_immutable(client, hashed_name):
+    response = client.get(f"/media/{hashed_name}")
+    assert response.status_code == HTTPStatus.OK
+    assert _body(response) == CONTENT
+    assert response["Content-Type"] == "image/jpeg"
+    assert "immutable" in response["Cache-Control"]
+    digest = ContentAddressedStorage.name_digest(hashed_name)
+    assert response["ETag"] == f'"{digest}"'
+
+
+def test_conditional_requests(client, hashed_name, plain_name):
+    etag = client.get(f"/media/{hashed_name}")["ETag"]
+    response = client.get(f"/media/{hashed_name}", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response["ETag"] == etag
+
+    plain = client.get(f"/media/{plain_name}")
+    assert "immutable" not in plain["Cache-Control"]
+    response = client.get(
+        f"/media/{plain_name}",
+        HTTP_IF_MODIFIED_SINCE=plain["Last-Modified"]
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    response = client.get(
+        f"/media/{plain_name}", HTTP_IF_MODIFIED_SINCE=http_date(0)
+    )
+    assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.parametrize("header, start, end", [
+    ("bytes=0-99", 0, 99),
+    ("bytes=1000-", 1000, 1023),
+    ("bytes=-24", 1000, 1023),
+    ("bytes=1000-5000", 1000, 1023),
+])
+def test_byte_ranges(client, hashed_name, header, start, end):
+    response = client.get(f"/media/{hashed_name}", HTTP_RANGE=header)
+    assert response.status_code == HTTPStatus.PARTIAL_CONTENT
+    assert response["Content-Range"] == f"bytes {start}-{end}/1024"
+    assert int(response["Content-Length"]) == end - start + 1
+    assert _body(response) == CONTENT[start:end + 1]
+
+
+def test_unsatisfiable_and_stale_ranges(client, hashed_name):
+    response = client.get(f"/media/{hashed_name}", HTTP_RANGE="bytes=2000-")
+    assert response.status_code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+    assert response["Content-Range"] == "bytes */1024"
+
+    response = client.get(
+        f"/media/{hashed_name}",
+        HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"stale"'
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert _body(response) == CONTENT
+
+    response = client.get(f"/media/{hashed_name}", HTTP_RANGE="bytes=5-3")
+    assert response.status_code == HTTPStatus.OK
+    assert _body(response) == CONTENT
+
+
+def test_sendfile_modes(client, settings, hashed_name, media_root):
+    settings.MEDIA_SENDFILE = "x-accel-redirect"
+    response = client.get(f"/media/{hashed_name}")
+    assert response["X-Accel-Redirect"] == f"/protected-media/{hashed_name}"
+    assert response.content == b""
+    assert "immutable" in response["Cache-Control"]
+
+    settings.MEDIA_SENDFILE = "x-sendfile"
+    response = client.get(f"/media/{hashed_name}")
+    assert response["X-Sendfile"] == str(media_root / hashed_name)
+
+
+@pytest.mark.parametrize("path", [
+    "missing.jpg", "../settings.py", "post_images/.upload-0123", "post_images"
+])
+def test_unavailable_files(client, media_root, hashed_name, path):
+    (media_root / "post_images" / ".upload-0123").write_bytes(b"partial")
+    assert client.get(f"/media/{path}").status_code == HTTPStatus.NOT_FOUND
+
+
+def test_only_safe_methods(client, hashed_name):
+    response = client.post(f"/media/{hashed_name}")
+    assert response.status_code == HTTPStatus.METHOD_NOT_ALLOWED
@@ -0,0 +1,49 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def _object_selects(queries, table):
+    return [
+        query["sql"] for query in queries
+        if query["sql"].startswith(f'SELECT "{table}"."id"')
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("action", ["edit", "delete"])
+def test_post_is_loaded_once(user_client, post_with_published_location,
+                             action):
+    url = f"/posts/{post_with_published_location.id}/{action}/"
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    assert len(_object_selects(queries, "blog_post")) == 1
+    assert len(_object_selects(queries, "auth_user")) == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("action", ["edit_comment", "delete_comment"])
+def test_comment_is_loaded_once(user_client, user, mixer,
+                                post_with_published_location, action):
+    comment = mixer.blend(
+        "blog.Comment", post=post_with_published_location, author=user
+    )
+    url = f"/posts/{comment.post_id}/{action}/{comment.id}/"
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    assert len(_object_selects(queries, "blog_comment")) == 1
+    assert len(_object_selects(queries, "auth_user")) == 1
+
+
+@pytest.mark.django_db
+def test_not_author_is_redirected(another_user_client,
+                                  post_with_published_location):
+    post = post_with_published_location
+    response = another_user_client.post(f"/posts/{post.id}/delete/")
+    assert response.status_code == HTTPStatus.FOUND
+    assert response.url == f"/posts/{post.id}/"
+    assert type(post).objects.filter(pk=post.pk).exists()
@@ -0,0 +1,128 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+def test_anonymous_pages_are_cached(
+        client, django_assert_num_queries, post_with_published_location):
+    post = post_with_published_location
+    urls = (
+        "/",
+        f"/posts/{post.id}/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+    )
+    for url in urls:
+        first = client.get(url)
+        assert first.status_code == HTTPStatus.OK
+        with django_assert_num_queries(0):
+            second = client.get(url)
+        assert second.content == first.content
+
+
+@pytest.mark.django_db
+def test_page_cache_is_bypassed_for_users(
+        user_client, post_with_published_location):
+    user_client.get("/")
+    response = user_client.get("/")
+    assert response.status_code == HTTPStatus.OK
+    assert response.context is not None
+
+
+@pytest.mark.django_db
+def test_page_cache_is_invalidated_by_changes(
+        mixer, client, post_with_published_location):
+    post = post_with_published_location
+    detail_url = f"/posts/{post.id}/"
+    category_url = f"/category/{post.category.slug}/"
+    client.get(detail_url)
+    client.get(category_url)
+
+    post.title = "Новый заголовок"
+    post.save()
+    assert "Новый заголовок" in client.get(detail_url).content.decode()
+    assert "Новый заголовок" in client.get(category_url).content.decode()
+
+    comment = mixer.blend("blog.Comment", post=post, text="Свежий")
+    assert "Свежий" in client.get(detail_url).content.decode()
+    assert "Комментарии (1)" in client.get("/").content.decode()
+
+    comment.delete()
+    assert "Свежий" not in client.get(detail_url).content.decode()
+
+    post.category.is_published = False
+    post.category.save()
+    assert client.get(detail_url).status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_post_card_fragment_follows_post_changes(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    profile_url = f"/profile/{post.author.username}/"
+    assert post.title in user_client.get(profile_url).content.decode()
+
+    post.title = "Обновлённый заголовок"
+    post.save()
+    for url in ("/", profile_url):
+        assert post.title in user_client.get(url).content.decode()
+
+
+@pytest.mark.django_db
+def test_page_cache_ignores_unknown_query_params(
+        client, django_assert_num_queries, post_with_published_location):
+    first = client.get("/", {"page": 1, "utm_source": "mail"})
+    with django_assert_num_queries(0):
+        second = client.get("/", {"utm_source": "feed", "page": 1})
+    assert second.content == first.content
+
+
+@pytest.mark.django_db
+def test_pages_follow_author_rename(client, post_with_published_location):
+    post = post_with_published_location
+    author = post.author
+    old_username = author.username
+    client.get("/")
+    client.get(f"/posts/{post.id}/")
+
+    author.username = "renamed_author"
+    author.save()
+    for url in ("/", f"/posts/{post.id}/"):
+        content = client.get(url).content.decode()
+        assert "/profile/renamed_author/" in content
+        assert f"/profile/{old_username}/" not in content
+    response = client.get("/profile/renamed_author/")
+    assert response.status_code == HTTPStatus.OK
+
+
+def _delete_post_queries(mixer, user, category, comments):
+    post = mixer.blend("blog.Post", author=user, category=category)
+    mixer.cycle(comments).blend("blog.Comment", post=post)
+    with CaptureQueriesContext(connection) as queries:
+        post.delete()
+    return len(queries)
+
+
+@pytest.mark.django_db
+def test_post_delete_cost_does_not_grow_with_comments(
+        mixer, user, published_category):
+    assert _delete_post_queries(
+        mixer, user, published_category, 40
+    ) == _delete_post_queries(mixer, user, published_category, 1)
+
+
+@pytest.mark.django_db
+def test_bulk_comment_delete_invalidates_pages(
+        mixer, client, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post, text="Удаляемый")
+    detail_url = f"/posts/{post.id}/"
+    assert "Удаляемый" in client.get(detail_url).content.decode()
+    assert "Комментарии (3)" in client.get("/").content.decode()
+
+    post.comments.all().delete()
+    assert "Удаляемый" not in client.get(detail_url).content.decode()
+    assert "Комментарии (0)" in client.get("/").content.decode()
@@ -0,0 +1,136 @@
+import base64
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.views import Index
+from conftest import N_PER_PAGE
+
+
+@pytest.fixture
+def public_posts(mixer, user, published_category):
+    now = timezone.now()
+    return mixer.cycle(N_PER_PAGE * 2 + 5).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=(now - timedelta(hours=i) for i in range(N_PER_PAGE * 3)),
+    )
+
+
+def _walk_keyset_pages(client, url):
+    seen = []
+    response = client.get(url, {"after": ""})
+    while True:
+        assert response.status_code == HTTPStatus.OK
+        page = response.context["page_obj"]
+        assert page.is_keyset
+        seen.extend(post.id for post in page)
+        if not page.has_next():
+            return seen, page
+        response = client.get(url, {"after": page.next_cursor})
+
+
+@pytest.mark.django_db
+def test_keyset_pages_cover_feed_in_order(client, public_posts):
+    seen, last_page = _walk_keyset_pages(client, "/")
+    expected = [
+        post.id
+        for post in sorted(public_posts, key=lambda p: p.pub_date,
+                           reverse=True)
+    ]
+    assert seen == expected
+
+    response = client.get("/", {"before": last_page.previous_cursor})
+    page = response.context["page_obj"]
+    assert [post.id for post in page] == expected[N_PER_PAGE:N_PER_PAGE * 2]
+    assert page.has_next() and page.has_previous()
+
+
+@pytest.mark.django_db
+def test_keyset_pagination_on_category_and_profile(
+        client, user, published_category, public_posts):
+    for url in (
+        f"/category/{published_category.slug}/",
+        f"/profile/{user.username}/",
+    ):
+        seen, _ = _walk_keyset_pages(client, url)
+        assert len(seen) == len(public_posts)
+
+
+@pytest.mark.django_db
+def test_invalid_cursor_returns_404(client, public_posts):
+    null_cursor = base64.urlsafe_b64encode(b"[null, 1]").decode()
+    for cursor in ("not-a-cursor", null_cursor):
+        response = client.get("/", {"after": cursor})
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_offset_pagination_is_default(client, public_posts):
+    response = client.get("/", {"page": 2})
+    page = response.context["page_obj"]
+    assert not getattr(page, "is_keyset", False)
+    assert page.number == 2
+
+
+@pytest.mark.django_db
+def test_feed_count_is_cached(user_client, public_posts):
+    user_client.get("/")
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get("/")
+    assert response.context["paginator"].count == len(public_posts)
+    assert not any("COUNT(" in query["sql"] for query in queries)
+
+    public_posts[0].delete()
+    response = user_client.get("/")
+    assert response.context["paginator"].count == len(public_posts) - 1
+
+
+@pytest.mark.django_db
+def test_feed_count_can_be_limited(monkeypatch, client, public_posts):
+    monkeypatch.setattr(Index, "count_limit", N_PER_PAGE + 1)
+    paginator = client.get("/").context["paginator"]
+    assert paginator.count == N_PER_PAGE + 1
+    assert paginator.is_approximate
+
+
+@pytest.mark.django_db
+def test_offset_pages_link_forward_by_cursor(client, public_posts):
+    response = client.get("/")
+    page = response.context["page_obj"]
+    assert f"after={page.next_cursor}" in response.content.decode()
+
+    response = client.get("/", {"after": page.next_cursor})
+    expected = client.get("/", {"page": 2}).context["page_obj"]
+    assert list(response.context["page_obj"]) == list(expected)
+    assert "page=1" not in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_deep_offset_pages_are_not_served(monkeypatch, client, public_posts):
+    monkeypatch.setattr("blog.mixins.MAX_OFFSET_PAGES", 2)
+    assert client.get("/", {"page": 2}).status_code == HTTPStatus.OK
+    response = client.get("/", {"page": 3})
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_last_counted_page_links_past_the_limit(
+        monkeypatch, client, public_posts):
+    monkeypatch.setattr(Index, "count_limit", N_PER_PAGE + 1)
+    response = client.get("/", {"page": 2})
+    page = response.context["page_obj"]
+    assert not page.has_next()
+    assert f"after={page.next_cursor}" in response.content.decode()
+
+    response = client.get("/", {"after": page.next_cursor})
+    expected = sorted(public_posts, key=lambda p: p.pub_date, reverse=True)
+    assert list(response.context["page_obj"]) == (
+        expected[N_PER_PAGE + 1:N_PER_PAGE * 2 + 1]
+    )
@@ -0,0 +1,61 @@
+from http import HTTPStatus
+
+import pytest
+
+from blog.cache import get_next_publication
+
+
+@pytest.mark.django_db
+def test_post_detail_runs_two_queries(
+        mixer, client, post_with_published_location,
+        django_assert_num_queries):
+    post = post_with_published_location
+    mixer.cycle(5).blend("blog.Comment", post=post)
+    get_next_publication()
+    with django_assert_num_queries(2):
+        response = client.get(f"/posts/{post.id}/")
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.context["comments"]) == 5
+
+
+@pytest.mark.django_db
+def test_hidden_post_is_visible_only_to_author(
+        client, user_client, post_with_published_location):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    assert client.get(f"/posts/{post.id}/").status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+    assert user_client.get(f"/posts/{post.id}/").status_code == HTTPStatus.OK
+
+
+@pytest.mark.django_db
+def test_comments_are_loaded_by_pages(
+        mixer, client, post_with_published_location):
+    post = post_with_published_location
+    comments = mixer.cycle(45).blend("blog.Comment", post=post)
+    response = client.get(f"/posts/{post.id}/")
+    page = response.context["comments"]
+    assert [c.id for c in page] == [c.id for c in comments[:20]]
+    assert page.has_next()
+
+    seen = [c.id for c in page]
+    while page.has_next():
+        response = client.get(
+            f"/posts/{post.id}/comments/", {"after": page.next_cursor}
+        )
+        assert response.status_code == HTTPStatus.OK
+        page = response.context["comments"]
+        seen.extend(c.id for c in page)
+    assert seen == [c.id for c in comments]
+
+
+@pytest.mark.django_db
+def test_comments_fragment_respects_post_visibility(
+        client, post_with_published_location):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    response = client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,40 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.fixture
+def profile_url(user, post_with_published_location):
+    return f"/profile/{user.username}/"
+
+
+@pytest.mark.django_db
+def test_owner_profile_queries(
+        user_client, profile_url, django_assert_num_queries):
+    user_client.get(profile_url)
+    # Сессия, пользователь и страница постов.
+    with django_assert_num_queries(3):
+        response = user_client.get(profile_url)
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.context["page_obj"]) == 1
+
+
+@pytest.mark.django_db
+def test_visitor_profile_queries(
+        another_user_client, profile_url, django_assert_num_queries):
+    another_user_client.get(profile_url)
+    # Сессия, пользователь, профиль и страница постов.
+    with django_assert_num_queries(4):
+        response = another_user_client.get(profile_url)
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.context["page_obj"]) == 1
+
+
+@pytest.mark.django_db
+def test_profile_count_is_cached_per_author(
+        another_user_client, user, profile_url, post_of_another_author):
+    another_user_client.get(profile_url)
+    own_url = f"/profile/{post_of_another_author.author.username}/"
+    for url, expected in ((profile_url, 1), (own_url, 1)):
+        paginator = another_user_client.get(url).context["paginator"]
+        assert paginator.count == expected
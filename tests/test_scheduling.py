@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+import pytest
+
+from blog.cache import get_next_publication
+
+
+@pytest.fixture
+def scheduled_post(mixer, user, published_category, frozen_now):
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=frozen_now["now"] + timedelta(hours=1),
+    )
+
+
+@pytest.mark.django_db
+def test_next_publication_is_cached_until_it_passes(
+        frozen_now, scheduled_post, django_assert_num_queries):
+    assert get_next_publication() == scheduled_post.pub_date
+    with django_assert_num_queries(0):
+        assert get_next_publication() == scheduled_post.pub_date
+
+    frozen_now["now"] += timedelta(hours=2)
+    with django_assert_num_queries(1):
+        assert get_next_publication() is None
+
+
+@pytest.mark.django_db
+def test_cached_feed_shows_post_when_it_goes_live(
+        client, frozen_now, scheduled_post):
+    for url in ("/", f"/category/{scheduled_post.category.slug}/"):
+        assert scheduled_post.title not in client.get(url).content.decode()
+
+    frozen_now["now"] += timedelta(minutes=59)
+    assert scheduled_post.title not in client.get("/").content.decode()
+
+    frozen_now["now"] += timedelta(minutes=2)
+    for url in ("/", f"/category/{scheduled_post.category.slug}/"):
+        response = client.get(url)
+        assert scheduled_post.title in response.content.decode()
+        assert response.context["paginator"].count == 1
+
+
+@pytest.mark.django_db
+def test_rescheduling_resets_next_publication(frozen_now, scheduled_post):
+    get_next_publication()
+    scheduled_post.pub_date = frozen_now["now"] + timedelta(days=1)
+    scheduled_post.save()
+    assert get_next_publication() == scheduled_post.pub_date
@@ -0,0 +1,43 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from blog.search import search_posts
+from conftest import search_ids
+
+
+@pytest.mark.django_db
+def test_search_ranks_public_posts(client, searchable_posts):
+    found = search_ids(client, "прогулка")
+    assert found == [searchable_posts["title"].id, searchable_posts["text"].id]
+    assert search_ids(client, "пирог") == [searchable_posts["other"].id]
+    assert search_ids(client, '"; DROP TABLE') == []
+    assert search_ids(client, "") == []
+
+
+@pytest.mark.django_db
+def test_search_index_follows_post_changes(client, searchable_posts):
+    post = searchable_posts["other"]
+    post.text = "Теперь здесь про прогулку."
+    post.save()
+    assert post.id in search_ids(client, "прогулку")
+
+    post.delete()
+    assert search_ids(client, "пирог") == []
+
+
+@pytest.mark.django_db
+def test_rebuild_search_index_command(client, searchable_posts):
+    call_command("rebuild_search_index", stdout=None)
+    assert search_ids(client, "яблоки") == [searchable_posts["other"].id]
+
+
+@pytest.mark.django_db
+def test_benchmark_seed_is_searchable():
+    call_command("benchmark_feed", seed=30, repeat=1, stdout=StringIO())
+    assert search_posts("benchmark").count() > 0
+
+    output = StringIO()
+    call_command("benchmark_search", "benchmark", repeat=2, stdout=output)
+    assert "count: best" in output.getvalue()
@@ -0,0 +1,152 @@
+import pytest
+from django.core.management import call_command
+from django.db import transaction
+from django.test import override_settings
+
+from blog.search import InvertedIndexBackend, get_backend, inverted
+from blog.search.inverted import tokenize
+from blog.search.stemmer import stem
+from conftest import search_ids
+
+
+@pytest.mark.parametrize(
+    "word, expected",
+    (
+        ("прогулка", "прогулк"),
+        ("прогулкой", "прогулк"),
+        ("важнейшими", "важн"),
+        ("вагонов", "вагон"),
+        ("возможность", "возможн"),
+        ("Ёлки", "елк"),
+        ("benchmark", "benchmark"),
+    ),
+)
+def test_russian_stemmer(word, expected):
+    assert stem(word) == expected
+
+
+def test_tokenize_stems_words():
+    assert tokenize("Долгие прогулки, 42!") == ["долг", "прогулк", "42"]
+
+
+@pytest.fixture
+def inverted_backend(tmp_path):
+    with override_settings(
+        SEARCH_BACKEND="inverted", SEARCH_INDEX_DIR=tmp_path
+    ):
+        get_backend.cache_clear()
+        yield get_backend()
+    get_backend.cache_clear()
+
+
+@pytest.mark.django_db
+def test_inverted_backend_is_selected(inverted_backend):
+    assert isinstance(inverted_backend, InvertedIndexBackend)
+
+
+@pytest.mark.django_db
+def test_inverted_index_follows_post_changes(
+        client, inverted_backend, searchable_posts,
+        django_capture_on_commit_callbacks):
+    assert search_ids(client, "прогулки") == [
+        searchable_posts["title"].id, searchable_posts["text"].id
+    ]
+    assert search_ids(client, "долгой прогулкой") == [
+        searchable_posts["text"].id
+    ]
+
+    post = searchable_posts["other"]
+    post.text = "Пирог к прогулке."
+    with django_capture_on_commit_callbacks(execute=True):
+        post.save()
+    assert post.id in search_ids(client, "прогулка")
+    assert search_ids(client, "яблоки") == []
+
+    with django_capture_on_commit_callbacks(execute=True):
+        post.delete()
+    assert search_ids(client, "пирог") == []
+
+    searchable_posts["title"].is_published = False
+    searchable_posts["title"].save()
+    assert search_ids(client, "прогулка") == [searchable_posts["text"].id]
+
+
+@pytest.mark.django_db
+def test_inverted_index_ignores_rolled_back_changes(
+        client, inverted_backend, searchable_posts):
+    post = searchable_posts["other"]
+    with pytest.raises(RuntimeError), transaction.atomic():
+        post.text = "Пирог к прогулке."
+        post.save()
+        raise RuntimeError
+    assert post.id not in search_ids(client, "прогулка")
+    assert search_ids(client, "яблоки") == [post.id]
+
+
+@pytest.mark.django_db
+def test_inverted_index_is_shared_through_disk(
+        client, tmp_path, inverted_backend, searchable_posts,
+        django_capture_on_commit_callbacks):
+    call_command("rebuild_search_index", stdout=None)
+    assert (tmp_path / "journal.log").stat().st_size == 0
+
+    other_process = InvertedIndexBackend(tmp_path)
+    assert other_process.rank({"яблок"}) == [searchable_posts["other"].id]
+
+    searchable_posts["title"].title = "Яблоки с гор"
+    with django_capture_on_commit_callbacks(execute=True):
+        searchable_posts["title"].save()
+    assert set(other_process.rank({"яблок"})) == {
+        searchable_posts["title"].id, searchable_posts["other"].id
+    }
+
+    call_command("rebuild_search_index", stdout=None)
+    assert other_process.rank({"яблок"})[0] == searchable_posts["title"].id
+
+
+@pytest.mark.django_db
+def test_rebuild_keeps_changes_made_during_scan(
+        mixer, user, published_category, tmp_path, inverted_backend,
+        searchable_posts, monkeypatch, django_capture_on_commit_callbacks):
+    write_snapshot = inverted.write_snapshot
+    late = {}
+
+    def write_after_concurrent_change(*args, **kwargs):
+        # Пост сохранён другим процессом уже после чтения базы.
+        with django_capture_on_commit_callbacks(execute=True):
+            late["post"] = mixer.blend(
+                "blog.Post", author=user, category=published_category,
+                title="Поздние яблоки", text="Текст."
+            )
+        write_snapshot(*args, **kwargs)
+
+    monkeypatch.setattr(
+        inverted, "write_snapshot", write_after_concurrent_change
+    )
+    other_process = InvertedIndexBackend(tmp_path)
+    other_process.rank({"яблок"})
+    inverted_backend.rebuild()
+
+    assert set(InvertedIndexBackend(tmp_path).rank({"яблок"})) == {
+        late["post"].id, searchable_posts["other"].id
+    }
+    assert set(other_process.rank({"яблок"})) == {
+        late["post"].id, searchable_posts["other"].id
+    }
+
+
+@pytest.mark.django_db
+def test_inverted_index_top_results_match_full_ranking(
+        mixer, user, published_category, inverted_backend):
+    mixer.cycle(12).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        title=mixer.sequence(lambda i: "Горы" if i % 3 else "Заметка"),
+        text=mixer.sequence(lambda i: "прогулка " * (i % 4 + 1)),
+    )
+    inverted_backend.rebuild()
+    for terms in ({"прогулк"}, {"прогулк", "гор"}):
+        full = inverted_backend.rank(terms)
+        for limit in range(1, len(full) + 1):
+            assert inverted_backend.rank(terms, limit) == full[:limit]
@@ -0,0 +1,83 @@
+import gzip
+from http import HTTPStatus
+
+import pytest
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+
+from core import storage as core_storage
+
+
+@pytest.fixture
+def collected(settings, tmp_path):
+    settings.STATIC_ROOT = tmp_path
+    settings.STATICFILES_STORAGE = (
+        "core.storage.CompressedManifestStaticFilesStorage"
+    )
+    call_command("collectstatic", interactive=False, verbosity=0)
+    return tmp_path
+
+
+def _body(response):
+    return b"".join(response.streaming_content)
+
+
+def test_collectstatic_writes_hashed_compressed_files(collected):
+    css = staticfiles_storage.stored_name("css/bootstrap.min.css")
+    assert css != "css/bootstrap.min.css"
+    original = (collected / css).read_bytes()
+    assert gzip.decompress((collected / f"{css}.gz").read_bytes()) == original
+    assert (collected / f"{css}.br").exists() == (
+        core_storage.brotli is not None
+    )
+    logo = staticfiles_storage.stored_name("img/logo.png")
+    assert not (collected / f"{logo}.gz").exists()
+
+
+@pytest.mark.django_db
+def test_pages_link_hashed_files(client, collected):
+    content = client.get("/").content.decode()
+    assert staticfiles_storage.url("css/bootstrap.min.css") in content
+    assert staticfiles_storage.url("img/fav/favicon.ico") in content
+
+
+def test_static_picks_encoding(client, collected):
+    css = staticfiles_storage.stored_name("css/bootstrap.min.css")
+    original = (collected / css).read_bytes()
+
+    response = client.get(f"/static/{css}", HTTP_ACCEPT_ENCODING="gzip")
+    assert response["Content-Encoding"] == "gzip"
+    assert response["Content-Type"].startswith("text/css")
+    assert "Accept-Encoding" in response["Vary"]
+    assert "immutable" in response["Cache-Control"]
+    assert gzip.decompress(_body(response)) == original
+    gzip_etag = response["ETag"]
+
+    response = client.get(
+        f"/static/{css}", HTTP_ACCEPT_ENCODING="gzip;q=0, identity"
+    )
+    assert not response.has_header("Content-Encoding")
+    assert _body(response) == original
+    assert response["ETag"] != gzip_etag
+
+    response = client.get(
+        f"/static/{css}",
+        HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=gzip_etag
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert "Accept-Encoding" in response["Vary"]
+
+
+def test_unhashed_static_is_not_immutable(client, collected):
+    response = client.get("/static/css/bootstrap.min.css")
+    assert response.status_code == HTTPStatus.OK
+    assert "immutable" not in response["Cache-Control"]
+
+
+@pytest.mark.parametrize("header", ["gzip, deflate, br", "br"])
+def test_static_prefers_brotli(client, collected, header):
+    if core_storage.brotli is None:
+        pytest.skip("brotli не установлен")
+    css = staticfiles_storage.stored_name("css/bootstrap.min.css")
+    response = client.get(f"/static/{css}", HTTP_ACCEPT_ENCODING=header)
+    assert response["Content-Encoding"] == "br"
@@ -0,0 +1,110 @@
+import hashlib
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from PIL import Image
+
+from blog.images import release_image
+from blog.models import ImageTask
+from conftest import create_image_post, image_upload
+from core.storage import ContentAddressedStorage
+
+
+def test_storage_names_files_by_content(tmp_path):
+    storage = ContentAddressedStorage(location=tmp_path)
+    digest = hashlib.sha256(b"content").hexdigest()
+
+    first = storage.save("post_images/a.JPG", ContentFile(b"content"))
+    second = storage.save("post_images/b.jpg", ContentFile(b"content"))
+    other = storage.save("post_images/a.jpg", ContentFile(b"other"))
+
+    assert first == second == f"post_images/{digest[:2]}/{digest[2:]}.jpg"
+    assert other != first
+    assert storage.open(first).read() == b"content"
+    assert sorted(
+        path.name for path in tmp_path.glob("post_images/*/*")
+    ) == sorted({f"{digest[2:]}.jpg", other.rsplit("/", 1)[1]})
+
+
+def _upload_with_description(description):
+    exif = Image.Exif()
+    exif[0x010E] = description
+    return image_upload(image_format="JPEG", exif=exif)
+
+
+@pytest.mark.django_db
+def test_identical_uploads_share_files(
+        user_client, published_category, media_root,
+        django_capture_on_commit_callbacks):
+    first = create_image_post(user_client, published_category)
+    call_command("process_image_tasks", once=True, workers=0, stdout=None)
+    first.refresh_from_db()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        second = create_image_post(user_client, published_category)
+    assert second.image.name == first.image.name
+    assert second.image_renditions == first.image_renditions
+    assert not second.image_processing
+    assert ImageTask.objects.count() == 1
+
+    files = [
+        media_root / name
+        for name in (first.image.name, *dict(first.image_renditions).values())
+    ]
+    with django_capture_on_commit_callbacks(execute=True):
+        first.delete()
+    assert all(path.exists() for path in files)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        second.delete()
+    assert not any(path.exists() for path in files)
+
+
+@pytest.mark.django_db
+def test_replaced_image_is_released(
+        user_client, published_category, media_root,
+        django_capture_on_commit_callbacks):
+    post = create_image_post(user_client, published_category)
+    original = media_root / post.image.name
+    with django_capture_on_commit_callbacks(execute=True):
+        post.image = "post_images/other.png"
+        post.save()
+    assert not original.exists()
+
+
+@pytest.mark.django_db
+def test_renditions_belong_to_their_original(
+        user_client, published_category, media_root,
+        django_capture_on_commit_callbacks):
+    first = create_image_post(
+        user_client, published_category, _upload_with_description("first")
+    )
+    second = create_image_post(
+        user_client, published_category, _upload_with_description("second")
+    )
+    call_command("process_image_tasks", once=True, workers=0, stdout=None)
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert first.image.name != second.image.name
+    kept = dict(second.image_renditions).values()
+    assert not set(dict(first.image_renditions).values()) & set(kept)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        first.delete()
+    assert all((media_root / name).exists() for name in kept)
+
+
+@pytest.mark.django_db
+def test_reused_file_is_kept_until_its_post_is_saved(tmp_path):
+    storage = ContentAddressedStorage(location=tmp_path)
+    name = storage.save("post_images/a.jpg", ContentFile(b"content"))
+    assert not storage.is_leased(name)
+
+    assert storage.save("post_images/b.jpg", ContentFile(b"content")) == name
+    assert not release_image(name, [], storage)
+    assert storage.exists(name)
+
+    storage.settle(name)
+    assert release_image(name, [], storage)
+    assert not storage.exists(name)
@@ -0,0 +1,40 @@
+import pytest
+
+from blog.models import Post
+
+
+@pytest.mark.django_db
+def test_save_bumps_version_and_updated_at(post_with_published_location):
+    post = post_with_published_location
+    version, updated_at = post.version, post.updated_at
+    cache_version = post.cache_version
+
+    post.title = "Новый заголовок"
+    post.save(update_fields=("title",))
+    stored = Post.objects.get(pk=post.pk)
+    assert stored.version == version + 1
+    assert stored.updated_at > updated_at
+    assert stored.cache_version == post.cache_version != cache_version
+
+
+@pytest.mark.django_db
+def test_comment_tracks_changes(mixer, post_with_published_location):
+    comment = mixer.blend("blog.Comment", post=post_with_published_location)
+    assert comment.version == 1
+    comment.text = "Исправлено"
+    comment.save()
+    comment.refresh_from_db()
+    assert comment.version == 2
+    assert comment.updated_at >= comment.created_at
+
+
+@pytest.mark.django_db
+def test_post_card_is_rerendered_after_edit(
+        client, post_with_published_location):
+    post = post_with_published_location
+    assert post.title in client.get("/").content.decode()
+    # Карточка из кэша обновляется, когда меняется версия публикации.
+    Post.objects.filter(pk=post.pk).update(title="Без сохранения")
+    post.save(update_fields=("pub_date",))
+    content = client.get("/").content.decode()
+    assert "Без сохранения" in content
@@ -0,0 +1,91 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client
+
+from blog.models import Post
+from conftest import image_post_data, image_upload
+
+
+def _image_errors(response):
+    assert response.status_code == HTTPStatus.OK
+    return response.context["form"].errors.get("image", [])
+
+
+@pytest.mark.django_db
+def test_valid_image_is_accepted(user_client, published_category, media_root):
+    response = user_client.post(
+        "/posts/create/", image_post_data(published_category, image_upload())
+    )
+    assert response.status_code == HTTPStatus.FOUND
+    assert Post.objects.get().image
+
+
+@pytest.mark.django_db
+def test_oversized_upload_is_stopped(
+        user_client, published_category, media_root, monkeypatch):
+    monkeypatch.setattr("blog.uploads.MAX_IMAGE_UPLOAD_SIZE", 1024)
+    response = user_client.post(
+        "/posts/create/", image_post_data(published_category, image_upload((400, 400)))
+    )
+    assert any("МБ" in error for error in _image_errors(response))
+    assert not Post.objects.exists()
+    assert not any(path.is_file() for path in media_root.rglob("*"))
+
+
+@pytest.mark.django_db
+def test_non_image_is_rejected_after_header_limit(
+        user_client, published_category, media_root, monkeypatch):
+    monkeypatch.setattr("blog.uploads.IMAGE_HEADER_LIMIT", 1024)
+    document = SimpleUploadedFile("photo.png", b"%PDF-1.4\n" + b"0" * 4096)
+    response = user_client.post(
+        "/posts/create/", image_post_data(published_category, document)
+    )
+    assert any("JPEG" in error for error in _image_errors(response))
+    assert not Post.objects.exists()
+    assert not any(path.is_file() for path in media_root.rglob("*"))
+
+
+@pytest.mark.django_db
+def test_short_non_image_is_rejected(
+        user_client, published_category, media_root):
+    document = SimpleUploadedFile("photo.png", b"%PDF-1.4\n")
+    response = user_client.post(
+        "/posts/create/", image_post_data(published_category, document)
+    )
+    assert _image_errors(response)
+    assert not Post.objects.exists()
+
+
+@pytest.mark.django_db
+def test_unsupported_format_is_rejected(
+        user_client, published_category, media_root):
+    response = user_client.post(
+        "/posts/create/",
+        image_post_data(published_category, image_upload(image_format="BMP"))
+    )
+    assert any("JPEG" in error for error in _image_errors(response))
+    assert not Post.objects.exists()
+
+
+@pytest.mark.django_db
+def test_large_dimensions_are_rejected(
+        user_client, published_category, media_root, monkeypatch):
+    monkeypatch.setattr("blog.uploads.MAX_IMAGE_SIDE", 500)
+    response = user_client.post(
+        "/posts/create/", image_post_data(published_category, image_upload())
+    )
+    assert any("точек" in error for error in _image_errors(response))
+    assert not Post.objects.exists()
+
+
+@pytest.mark.django_db
+def test_csrf_is_still_checked(user, published_category, media_root):
+    client = Client(enforce_csrf_checks=True)
+    client.force_login(user)
+    response = client.post(
+        "/posts/create/", image_post_data(published_category, image_upload())
+    )
+    assert response.status_code == HTTPStatus.FORBIDDEN
+    assert not Post.objects.exists()